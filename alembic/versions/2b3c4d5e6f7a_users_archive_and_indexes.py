@@ -0,0 +1,63 @@
+"""Users archive table and is_deleted indexes
+
+Revision ID: 2b3c4d5e6f7a
+Revises: 1a2b3c4d5e6f
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision: str = "2b3c4d5e6f7a"
+down_revision: Union[str, None] = "1a2b3c4d5e6f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_users_is_deleted_created_at",
+        "users",
+        ["is_deleted", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_users_is_deleted_deleted_at",
+        "users",
+        ["is_deleted", "deleted_at"],
+        unique=False,
+    )
+
+    op.create_table(
+        "users_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("email", sa.String(length=100), nullable=False),
+        sa.Column("hashed_password", sa.String(length=255), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_users_archive_email"), "users_archive", ["email"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_users_archive_email"), table_name="users_archive")
+    op.drop_table("users_archive")
+    op.drop_index("ix_users_is_deleted_deleted_at", table_name="users")
+    op.drop_index("ix_users_is_deleted_created_at", table_name="users")
@@ -0,0 +1,68 @@
+"""Follows table and users follower counters
+
+Revision ID: 4d5e6f7a8b9c
+Revises: 3c4d5e6f7a8b
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision: str = "4d5e6f7a8b9c"
+down_revision: Union[str, None] = "3c4d5e6f7a8b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "followers_count", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.add_column(
+        "users",
+        sa.Column(
+            "following_count", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+
+    op.create_table(
+        "follows",
+        sa.Column("follower_id", sa.Integer(), nullable=False),
+        sa.Column("followee_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["followee_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["follower_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("follower_id", "followee_id"),
+    )
+    op.create_index(
+        "ix_follows_followee_created_at",
+        "follows",
+        ["followee_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_follows_follower_created_at",
+        "follows",
+        ["follower_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_follows_follower_created_at", table_name="follows")
+    op.drop_index("ix_follows_followee_created_at", table_name="follows")
+    op.drop_table("follows")
+    op.drop_column("users", "following_count")
+    op.drop_column("users", "followers_count")
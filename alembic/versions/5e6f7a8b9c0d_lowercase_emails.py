@@ -0,0 +1,45 @@
+"""Store existing emails in normalized (trimmed, lowercase) form
+
+Revision ID: 5e6f7a8b9c0d
+Revises: 4d5e6f7a8b9c
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision: str = "5e6f7a8b9c0d"
+down_revision: Union[str, None] = "4d5e6f7a8b9c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # Collation case-insensitive (default MySQL) sudah menolak duplikat beda
+    # huruf lewat unique index; di backend lain cek dulu supaya error-nya jelas
+    duplicates = conn.execute(
+        sa.text(
+            "SELECT LOWER(TRIM(email)) AS normalized FROM users "
+            "GROUP BY LOWER(TRIM(email)) HAVING COUNT(*) > 1"
+        )
+    ).fetchall()
+    if duplicates:
+        raise RuntimeError(
+            "Emails that only differ by case/whitespace must be merged first: "
+            + ", ".join(row[0] for row in duplicates)
+        )
+
+    # Tanpa WHERE: di collation case-insensitive `email <> LOWER(email)` selalu
+    # false, jadi row mixed-case tidak akan ikut ter-update
+    op.execute("UPDATE users SET email = LOWER(TRIM(email))")
+    op.execute("UPDATE users_archive SET email = LOWER(TRIM(email))")
+
+
+def downgrade() -> None:
+    # Bentuk asli email tidak disimpan; tidak ada yang perlu dikembalikan
+    pass
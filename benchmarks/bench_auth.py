@@ -0,0 +1,65 @@
+"""
+Login storm: throughput bcrypt dan responsivitas event loop,
+bcrypt inline di event loop vs ProcessPoolExecutor.
+
+    python -m benchmarks.bench_auth
+"""
+import asyncio
+import time
+
+from src.core import auth
+
+LOGINS = 32
+ROUNDS = 10
+TICK = 0.01
+
+
+async def monitor_loop_lag(stop: asyncio.Event) -> float:
+    """Return keterlambatan maksimum (detik) dari sleep TICK"""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        worst = max(worst, time.perf_counter() - start - TICK)
+    return worst
+
+
+async def run(label: str, verify) -> None:
+    hashed = auth._hash_password("login-storm-password", ROUNDS)
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_loop_lag(stop))
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(verify("login-storm-password", hashed) for _ in range(LOGINS))
+    )
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    worst_lag = await monitor
+    print(
+        f"  {label:<22} {LOGINS / elapsed:>8.1f} logins/s"
+        f"   max loop lag {worst_lag * 1000:>8.1f} ms"
+    )
+
+
+async def inline_verify(password: str, hashed: str) -> bool:
+    # Implementasi naif: bcrypt langsung di coroutine
+    return auth._verify_password(password, hashed)
+
+
+async def main() -> None:
+    print(f"\n{LOGINS} concurrent logins, bcrypt rounds={ROUNDS}")
+    await run("inline (blocking)", inline_verify)
+
+    auth.start_password_pool()
+    try:
+        await auth.verify_password("warmup", auth._hash_password("warmup", 4))
+        await run("process pool", auth.verify_password)
+    finally:
+        auth.shutdown_password_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Benchmark serialisasi: response GraphQL dan payload cache, sebelum vs sesudah.
+
+    python -m benchmarks.bench_serialization
+"""
+import json
+import timeit
+from datetime import datetime, timezone
+from typing import List
+
+import orjson
+from pydantic import TypeAdapter
+
+from src.core.cache import _value_type, get_type_adapter
+from src.features.users.schemas import User
+
+PAGE_SIZES = (100, 1000)
+
+
+def make_users(n: int) -> List[User]:
+    now = datetime.now(timezone.utc)
+    return [
+        User(
+            id=i,
+            name=f"User {i}",
+            email=f"user{i}@example.com",
+            is_active=True,
+            created_at=now,
+            updated_at=None,
+        )
+        for i in range(n)
+    ]
+
+
+def make_response(users: List[User]) -> dict:
+    # Bentuk output process_result(): scalar sudah di-serialize oleh graphql-core
+    return {
+        "data": {
+            "users": {
+                "items": [
+                    {
+                        "id": u.id,
+                        "name": u.name,
+                        "email": u.email,
+                        "isActive": u.is_active,
+                        "createdAt": u.created_at.isoformat() if u.created_at else None,
+                    }
+                    for u in users
+                ]
+            }
+        }
+    }
+
+
+def bench(label: str, func, number: int) -> float:
+    per_call = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<40} {per_call * 1e6:>10.1f} us")
+    return per_call
+
+
+def main() -> None:
+    list_type = List[User]
+    for n in PAGE_SIZES:
+        users = make_users(n)
+        response = make_response(users)
+        cached_str = TypeAdapter(list_type).dump_json(users).decode("utf-8")
+        cached_bytes = cached_str.encode()
+        number = max(10, 20_000 // n)
+
+        print(f"\n{n} users")
+        before = bench("response json.dumps", lambda: json.dumps(response), number)
+        after = bench("response orjson.dumps", lambda: orjson.dumps(response), number)
+        print(f"  -> {before / after:.1f}x")
+
+        # `list` polos tidak bisa lagi di-infer (User punya field resolver),
+        # jadi baseline memakai type yang sama tapi adapter baru per call
+        before = bench(
+            "cache set: new TypeAdapter + decode",
+            lambda: TypeAdapter(list_type).dump_json(users).decode("utf-8"),
+            number,
+        )
+        after = bench(
+            "cache set: cached typed adapter, bytes",
+            lambda: get_type_adapter(_value_type(users)).dump_json(users),
+            number,
+        )
+        print(f"  -> {before / after:.1f}x")
+
+        before = bench(
+            "cache get: new TypeAdapter, str",
+            lambda: TypeAdapter(list_type).validate_json(cached_str),
+            number,
+        )
+        after = bench(
+            "cache get: cached adapter, bytes",
+            lambda: get_type_adapter(list_type).validate_json(cached_bytes),
+            number,
+        )
+        print(f"  -> {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Load test end-to-end untuk GraphQL API.
+
+In-process (ASGI, SQLite + Redis stand-in memory://):
+    python -m benchmarks.loadtest --concurrency 20 --duration 30
+    python -m benchmarks.loadtest --rate 200 --duration 30
+
+Terhadap server yang sudah jalan (mis. uvicorn lokal):
+    python -m benchmarks.loadtest --url http://localhost:8000 --rate 200
+
+Regression gate:
+    python -m benchmarks.loadtest --save-baseline benchmarks/loadtest/baseline.json
+    python -m benchmarks.loadtest --baseline benchmarks/loadtest/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+import httpx
+
+from benchmarks.loadtest import baseline as baseline_io
+from benchmarks.loadtest.operations import DEFAULT_MIX, Workload, parse_mix
+from benchmarks.loadtest.runner import LoadRunner
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest")
+    parser.add_argument("--url", help="Target server; default in-process ASGI")
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./loadtest.db")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="e.g. users=40,user=40")
+    parser.add_argument("--seed-users", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=20.0)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--concurrency", type=int, default=10)
+    mode.add_argument("--rate", type=float, help="Fixed arrival rate (req/s)")
+    parser.add_argument("--baseline", type=Path, help="Compare with stored baseline")
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Allowed regression (0.10=10%%)"
+    )
+    parser.add_argument("--output", type=Path, help="Write summary JSON here")
+    return parser.parse_args(argv)
+
+
+async def _create_schema() -> None:
+    from src.core.base import Base
+    from src.core.database import engine
+    from src.features.users import models  # noqa: F401  (register tables)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    workload = Workload(mix=parse_mix(args.mix))
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=30)
+        lifespan = None
+    else:
+        # Settings dibaca saat import, jadi env harus di-set sebelum import src
+        os.environ.setdefault("DATABASE_URL", args.database_url)
+        os.environ.setdefault("REDIS_URL", "memory://")
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        from src.main import create_app
+
+        app = create_app()
+        await _create_schema()
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+        client = httpx.AsyncClient(app=app, base_url="http://loadtest", timeout=30)
+
+    try:
+        runner = LoadRunner(client, workload)
+        await runner.seed(args.seed_users)
+        if args.rate:
+            result = await runner.run_open(args.rate, args.duration)
+        else:
+            result = await runner.run_closed(args.concurrency, args.duration)
+    finally:
+        await client.aclose()
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+
+    summary = result.summary()
+    summary["config"] = {
+        "mode": f"rate={args.rate}" if args.rate else f"concurrency={args.concurrency}",
+        "mix": args.mix,
+        "target": args.url or "in-process",
+    }
+    return summary
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    summary = asyncio.run(run(args))
+    print(json.dumps(summary, indent=2))
+
+    if args.output:
+        baseline_io.save(args.output, summary)
+    if args.save_baseline:
+        baseline_io.save(args.save_baseline, summary)
+        print(f"baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        regressions = baseline_io.compare(
+            summary, baseline_io.load(args.baseline), args.threshold
+        )
+        if regressions:
+            print("REGRESSION:", *regressions, sep="\n  ", file=sys.stderr)
+            return 1
+        print("no regression against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
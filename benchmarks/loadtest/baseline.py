@@ -0,0 +1,36 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+def load(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def save(path: Path, summary: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(summary, indent=2, sort_keys=True) + "\n")
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Return daftar regresi (kosong = lolos). threshold 0.1 = toleransi 10%"""
+    regressions = []
+
+    base_rps = baseline.get("throughput_rps", 0)
+    if base_rps and current["throughput_rps"] < base_rps * (1 - threshold):
+        regressions.append(
+            f"throughput {current['throughput_rps']} rps < baseline {base_rps} rps"
+        )
+
+    for name, base in baseline.get("operations", {}).items():
+        stats = current["operations"].get(name)
+        if not stats:
+            continue
+        if base["p99_ms"] and stats["p99_ms"] > base["p99_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name} p99 {stats['p99_ms']} ms > baseline {base['p99_ms']} ms"
+            )
+
+    return regressions
@@ -0,0 +1,75 @@
+import math
+from typing import Dict, Iterable
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram: bucket log-linear (per power of two dibagi
+    `sub_buckets` bucket linear) sehingga error relatif tetap kecil
+    (~1/sub_buckets) untuk rentang mikrodetik sampai menit, dengan memory kecil.
+    Nilai direkam dalam mikrodetik.
+    """
+
+    def __init__(self, sub_buckets: int = 128):
+        self.sub_buckets = sub_buckets
+        self._sub_bits = int(math.log2(sub_buckets))
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.min = math.inf
+        self.max = 0.0
+        self.sum = 0.0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_buckets:
+            return value
+        shift = value.bit_length() - self._sub_bits - 1
+        return ((shift + 1) << self._sub_bits) + ((value >> shift) - self.sub_buckets)
+
+    def _upper_bound(self, index: int) -> int:
+        if index < self.sub_buckets:
+            return index
+        shift = (index >> self._sub_bits) - 1
+        sub = (index & (self.sub_buckets - 1)) + self.sub_buckets
+        return ((sub + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        micros = max(0, int(seconds * 1_000_000))
+        index = self._index(micros)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.sum += micros
+        self.min = min(self.min, micros)
+        self.max = max(self.max, micros)
+
+    def percentile(self, p: float) -> float:
+        """Percentile dalam milidetik"""
+        if not self.total:
+            return 0.0
+        target = max(1, math.ceil(self.total * p / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._upper_bound(index), self.max) / 1000
+        return self.max / 1000
+
+    def merge(self, others: Iterable["LatencyHistogram"]) -> "LatencyHistogram":
+        for other in others:
+            for index, count in other.counts.items():
+                self.counts[index] = self.counts.get(index, 0) + count
+            self.total += other.total
+            self.sum += other.sum
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        return self
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.total,
+            "mean_ms": round(self.sum / self.total / 1000, 3) if self.total else 0.0,
+            "p50_ms": round(self.percentile(50), 3),
+            "p90_ms": round(self.percentile(90), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "p999_ms": round(self.percentile(99.9), 3),
+            "max_ms": round(self.max / 1000, 3),
+        }
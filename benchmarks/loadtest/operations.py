@@ -0,0 +1,108 @@
+import itertools
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+USER_FIELDS = "id name email"
+
+USERS_QUERY = f"""
+query Users($skip: Int!, $limit: Int!) {{
+  users(skip: $skip, limit: $limit) {{
+    ... on UserCollection {{ items {{ {USER_FIELDS} }} }}
+    ... on DatabaseError {{ message }}
+  }}
+}}
+"""
+
+USER_QUERY = f"""
+query User($id: Int!) {{
+  user(id: $id) {{
+    ... on User {{ {USER_FIELDS} }}
+    ... on UserNotFoundError {{ message }}
+  }}
+}}
+"""
+
+CREATE_USER = f"""
+mutation CreateUser($name: String!, $email: String!) {{
+  createUser(input: {{name: $name, email: $email}}) {{
+    ... on User {{ {USER_FIELDS} }}
+    ... on ValidationError {{ message }}
+  }}
+}}
+"""
+
+UPDATE_USER = f"""
+mutation UpdateUser($id: Int!, $name: String!) {{
+  updateUser(id: $id, input: {{name: $name}}) {{
+    ... on User {{ {USER_FIELDS} }}
+    ... on UserNotFoundError {{ message }}
+  }}
+}}
+"""
+
+DEFAULT_MIX = "users=40,user=40,createUser=10,updateUser=10"
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    """'users=40,user=40' -> {'users': 40, 'user': 40}"""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}, choose from {OPERATIONS}")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+OPERATIONS = ("users", "user", "createUser", "updateUser")
+
+
+@dataclass
+class Workload:
+    """State workload: ID user yang dikenal untuk query/update acak"""
+
+    mix: Dict[str, int]
+    user_ids: List[int] = field(default_factory=list)
+    seed: int = 42
+    _counter: "itertools.count[int]" = field(default_factory=itertools.count)
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+        self._names = list(self.mix)
+        self._weights = [self.mix[name] for name in self._names]
+
+    def next_operation(self) -> Tuple[str, Dict[str, Any]]:
+        name = self._random.choices(self._names, self._weights)[0]
+        return name, self.payload(name)
+
+    def payload(self, name: str) -> Dict[str, Any]:
+        if name == "users":
+            return {
+                "query": USERS_QUERY,
+                "variables": {"skip": self._random.choice((0, 0, 0, 20)), "limit": 20},
+            }
+        if name == "createUser":
+            n = next(self._counter)
+            return {
+                "query": CREATE_USER,
+                "variables": {
+                    "name": f"Load User {n}",
+                    "email": f"load-{self.seed}-{n}@example.com",
+                },
+            }
+
+        user_id = self._random.choice(self.user_ids) if self.user_ids else 1
+        if name == "user":
+            return {"query": USER_QUERY, "variables": {"id": user_id}}
+        return {
+            "query": UPDATE_USER,
+            "variables": {"id": user_id, "name": f"Renamed {next(self._counter)}"},
+        }
+
+    def observe(self, name: str, body: Dict[str, Any]) -> None:
+        if name != "createUser":
+            return
+        created = (body.get("data") or {}).get("createUser") or {}
+        if "id" in created:
+            self.user_ids.append(int(created["id"]))
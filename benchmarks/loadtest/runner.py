@@ -0,0 +1,112 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import httpx
+
+from benchmarks.loadtest.histogram import LatencyHistogram
+from benchmarks.loadtest.operations import Workload
+
+
+@dataclass
+class RunResult:
+    duration: float
+    histograms: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return sum(h.total for h in self.histograms.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.duration if self.duration else 0.0
+
+    def summary(self) -> Dict[str, object]:
+        overall = LatencyHistogram().merge(self.histograms.values())
+        return {
+            "duration_s": round(self.duration, 3),
+            "throughput_rps": round(self.throughput, 2),
+            "errors": dict(self.errors),
+            "overall": overall.summary(),
+            "operations": {
+                name: histogram.summary()
+                for name, histogram in sorted(self.histograms.items())
+            },
+        }
+
+
+class LoadRunner:
+    def __init__(self, client: httpx.AsyncClient, workload: Workload):
+        self.client = client
+        self.workload = workload
+        self.result = RunResult(duration=0.0)
+
+    async def _send(self, scheduled_at: Optional[float] = None) -> None:
+        name, payload = self.workload.next_operation()
+        # Open loop: latency dihitung dari jadwal kirim (coordinated omission)
+        start = scheduled_at if scheduled_at is not None else time.perf_counter()
+        ok = False
+        try:
+            response = await self.client.post("/graphql", json=payload)
+            body = response.json()
+            ok = response.status_code == 200 and not body.get("errors")
+            if ok:
+                self.workload.observe(name, body)
+        except (httpx.HTTPError, ValueError):
+            ok = False
+
+        elapsed = time.perf_counter() - start
+        self.result.histograms.setdefault(name, LatencyHistogram()).record(elapsed)
+        if not ok:
+            self.result.errors[name] = self.result.errors.get(name, 0) + 1
+
+    async def seed(self, users: int) -> None:
+        for _ in range(users):
+            payload = self.workload.payload("createUser")
+            response = await self.client.post("/graphql", json=payload)
+            self.workload.observe("createUser", response.json())
+
+    async def run_closed(self, concurrency: int, duration: float) -> RunResult:
+        """Fixed concurrency: N worker, masing-masing kirim request berikutnya setelah selesai"""
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                await self._send()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        self.result.duration = time.perf_counter() - start
+        return self.result
+
+    async def run_open(
+        self, rate: float, duration: float, max_in_flight: int = 1000
+    ) -> RunResult:
+        """Fixed arrival rate: request dijadwalkan setiap 1/rate detik"""
+        interval = 1.0 / rate
+        in_flight = asyncio.Semaphore(max_in_flight)
+        tasks = set()
+
+        async def send(scheduled_at: float):
+            async with in_flight:
+                await self._send(scheduled_at)
+
+        start = time.perf_counter()
+        n = 0
+        while True:
+            scheduled_at = start + n * interval
+            if scheduled_at - start >= duration:
+                break
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.create_task(send(scheduled_at))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            n += 1
+
+        await asyncio.gather(*tasks)
+        self.result.duration = time.perf_counter() - start
+        return self.result
@@ -16,5 +16,11 @@ echo "✅ Redis is ready"
 echo "🚀 Running database migrations..."
 alembic upgrade head
 
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+  # Metrics multi-worker: mulai dari direktori bersih setiap start
+  rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 echo "🎯 Starting application..."
 exec "$@"
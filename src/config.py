@@ -19,17 +19,78 @@ class Settings(BaseSettings):
     DATABASE_POOL_SIZE: int = 10
     DATABASE_MAX_OVERFLOW: int = 20
 
+    # SQL profiling (fingerprint stats, slow query log + EXPLAIN)
+    SQL_PROFILING_ENABLED: bool = False
+    SQL_SLOW_QUERY_MS: int = 200
+    SQL_EXPLAIN_SLOW_QUERIES: bool = True
+
+    # Archival user yang di-soft delete
+    USER_ARCHIVE_ENABLED: bool = False
+    USER_ARCHIVE_AFTER_DAYS: int = 30
+    USER_ARCHIVE_BATCH_SIZE: int = 500
+    USER_ARCHIVE_BATCH_PAUSE: float = 0.5
+    USER_ARCHIVE_INTERVAL: int = 3600
+
+    # GraphQL
+    GRAPHQL_MAX_BATCH_SIZE: int = 10  # 0 = HTTP batching dimatikan
+    USERS_STREAM_BATCH_SIZE: int = 100  # row per pesan subscription usersStream
+    USERS_STREAM_MAX_LIMIT: int = 10_000
+    DATALOADER_MAX_BATCH_SIZE: int = 500  # key per query IN (...)
+    DATALOADER_MAX_CONCURRENCY: int = 4  # chunk paralel (session) per batch
+
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_BCRYPT_ROUNDS: int = 12
+    AUTH_HASH_WORKERS: int = 2  # process pool untuk bcrypt
+    AUTH_HASH_MAX_PENDING: int = 64
+    AUTH_TOKEN_CACHE_SIZE: int = 10_000
 
     # Rate Limiting
     RATE_LIMIT_REQUESTS: int = 100
     RATE_LIMIT_PERIOD: int = 60
     REDIS_URL: str = "redis://localhost:6379/0"
+    # Node cache (dipisah koma) untuk sharding client-side; kosong = pakai REDIS_URL
+    CACHE_REDIS_URLS: str = ""
     CACHE_TTL: int = 3600
     CACHE_ENABLED: bool = True
+    CACHE_NEGATIVE_TTL: int = 30
+    # Value >= threshold (bytes) dikompresi; codec: lz4 (kalau ter-install) atau zlib
+    CACHE_COMPRESSION_ENABLED: bool = True
+    CACHE_COMPRESSION_THRESHOLD: int = 1024
+    CACHE_COMPRESSION_CODEC: str = "lz4"
+    CACHE_COMPRESSION_LEVEL: int = 1  # zlib; level rendah = cepat
+
+    # Timeout Redis dan circuit breaker cache
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    REDIS_CONNECT_TIMEOUT: float = 0.5
+    CACHE_OPERATION_TIMEOUT: float = 0.25
+    CACHE_PATTERN_TIMEOUT: float = 5.0  # delete_pattern (SCAN) butuh lebih lama
+    CACHE_BREAKER_FAILURE_THRESHOLD: int = 5
+    CACHE_BREAKER_RESET_TIMEOUT: float = 10.0
+
+    # Post-commit invalidation queue
+    INVALIDATION_COALESCE_MS: int = 20
+    INVALIDATION_MAX_RETRIES: int = 5
+    INVALIDATION_RETRY_BASE: float = 0.2
+    INVALIDATION_OUTBOX_ENABLED: bool = False
+    INVALIDATION_OUTBOX_REPLAY_INTERVAL: int = 30
+    INVALIDATION_OUTBOX_GRACE: int = 30  # detik sebelum row outbox dianggap tertinggal
+
+    # Refresh-ahead untuk hot keys
+    CACHE_REFRESH_ENABLED: bool = False
+    CACHE_REFRESH_INTERVAL: int = 10
+    CACHE_REFRESH_TOP_N: int = 50
+    CACHE_REFRESH_AHEAD: int = 15  # refresh kalau TTL tersisa <= detik ini
+    CACHE_REFRESH_CONCURRENCY: int = 4
+
+    # Bloom filter untuk ID user (reject ID invalid tanpa I/O)
+    USER_ID_FILTER_ENABLED: bool = False
+    USER_ID_FILTER_REBUILD_INTERVAL: int = 300
+    USER_ID_FILTER_ERROR_RATE: float = 0.01
+    # ID sedekat ini dengan max_id dianggap ada (auto-increment commit tidak berurutan)
+    USER_ID_FILTER_SAFETY_MARGIN: int = 1000
 
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -0,0 +1,165 @@
+"""
+Password hashing dan JWT.
+
+bcrypt sengaja lambat (~100-250 ms per hash), jadi dijalankan di
+ProcessPoolExecutor yang dibatasi supaya event loop tetap responsif.
+Token yang sudah diverifikasi disimpan di LRU sehingga request berikutnya
+dengan token yang sama tidak perlu cek signature lagi.
+"""
+import asyncio
+import secrets
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+import bcrypt
+from jose import JWTError, jwt
+from starlette.requests import HTTPConnection
+
+from src.config import settings
+
+_executor: Optional[Executor] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+# Hash dummy dengan cost yang sama dengan hash asli (AUTH_BCRYPT_ROUNDS)
+_dummy_hash: Optional[str] = None
+
+
+def _hash_password(password: str, rounds: int) -> str:
+    # bcrypt hanya memakai 72 byte pertama
+    secret = password.encode("utf-8")[:72]
+    return bcrypt.hashpw(secret, bcrypt.gensalt(rounds)).decode("ascii")
+
+
+def _verify_password(password: str, hashed: str) -> bool:
+    try:
+        return bcrypt.checkpw(password.encode("utf-8")[:72], hashed.encode("ascii"))
+    except ValueError:
+        return False
+
+
+def start_password_pool(max_workers: int = settings.AUTH_HASH_WORKERS) -> None:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=max_workers)
+
+
+def shutdown_password_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+async def _run_in_pool(func, *args):
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(settings.AUTH_HASH_MAX_PENDING)
+
+    # Batasi antrian: saat login storm request menunggu di sini, bukan di pool
+    async with _semaphore:
+        loop = asyncio.get_running_loop()
+        # Tanpa pool (mis. di test) pakai default thread pool, bcrypt melepas GIL
+        return await loop.run_in_executor(_executor, func, *args)
+
+
+async def hash_password(password: str) -> str:
+    return await _run_in_pool(_hash_password, password, settings.AUTH_BCRYPT_ROUNDS)
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await _run_in_pool(_verify_password, password, hashed)
+
+
+async def dummy_password_hash() -> str:
+    """
+    Hash pembanding untuk login dengan email tidak terdaftar, supaya waktunya
+    sama dengan login user asli. Dibuat sekali (di-warm saat startup).
+    """
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await hash_password(secrets.token_urlsafe(16))
+    return _dummy_hash
+
+
+def create_access_token(user_id: int, expires_delta: Optional[timedelta] = None) -> str:
+    expire = datetime.now(timezone.utc) + (
+        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    claims = {"sub": str(user_id), "exp": expire}
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+class TokenCache:
+    """LRU token -> claims yang sudah diverifikasi"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        claims = self._items.get(token)
+        if claims is None:
+            return None
+        if claims.get("exp", 0) <= time.time():
+            del self._items[token]
+            return None
+        self._items.move_to_end(token)
+        return claims
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        self._items[token] = claims
+        self._items.move_to_end(token)
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+token_cache = TokenCache(settings.AUTH_TOKEN_CACHE_SIZE)
+
+
+def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+
+    try:
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+
+    token_cache.put(token, claims)
+    return claims
+
+
+class Authenticator:
+    """Authenticator per request, token baru di-decode saat pertama diminta"""
+
+    def __init__(self, connection: HTTPConnection):
+        self.connection = connection
+        self._decoded = False
+        self._claims: Optional[Dict[str, Any]] = None
+
+    @property
+    def claims(self) -> Optional[Dict[str, Any]]:
+        if not self._decoded:
+            self._decoded = True
+            scheme, _, token = self.connection.headers.get(
+                "authorization", ""
+            ).partition(" ")
+            if scheme.lower() == "bearer" and token:
+                self._claims = decode_access_token(token)
+        return self._claims
+
+    @property
+    def user_id(self) -> Optional[int]:
+        claims = self.claims
+        if not claims or "sub" not in claims:
+            return None
+        try:
+            return int(claims["sub"])
+        except (TypeError, ValueError):
+            return None
@@ -1,5 +1,5 @@
 from sqlalchemy import Boolean, Column, DateTime, func
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Mapped, declarative_base, mapped_column
 
 Base = declarative_base()
 
@@ -7,7 +7,7 @@ Base = declarative_base()
 class SoftDeleteMixin:
     """Mixin untuk soft delete"""
 
-    is_deleted = Column(Boolean, default=False, nullable=False)  # type: ignore
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     deleted_at = Column(DateTime(timezone=True), nullable=True)
 
     def soft_delete(self):
@@ -0,0 +1,78 @@
+import hashlib
+import math
+from typing import Iterable, Iterator, Optional
+
+
+class BloomFilter:
+    """Probabilistic set: tidak ada false negative, false positive ~error_rate"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: object) -> Iterator[int]:
+        digest = hashlib.blake2b(str(item).encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: object) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: object) -> bool:
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item)
+        )
+
+
+class IdFilter:
+    """
+    Bloom filter atas ID integer auto-increment.
+    ID di atas max_id saat build selalu dianggap ada, jadi user yang dibuat
+    di worker lain (sebelum rebuild berikutnya) tidak pernah ditolak.
+    Auto-increment bisa commit tidak berurutan (102 terlihat saat 101 belum
+    commit), jadi ID dalam `safety_margin` di bawah max_id juga dianggap ada.
+    """
+
+    def __init__(self, error_rate: float = 0.01, safety_margin: int = 0):
+        self.error_rate = error_rate
+        self.safety_margin = safety_margin
+        self._bloom: Optional[BloomFilter] = None
+        self._max_id = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._bloom is not None
+
+    def rebuild(
+        self, ids: Iterable[int], capacity: int, max_id: Optional[int] = None
+    ) -> None:
+        """
+        max_id: batas atas yang dibaca sebelum scan; ID yang commit selama scan
+        (dan tidak ikut ter-scan) tetap berada di zona "mungkin ada".
+        """
+        # Build filter baru lalu swap, request yang berjalan tetap pakai filter lama
+        bloom = BloomFilter(capacity, self.error_rate)
+        seen_max = 0
+        for id_ in ids:
+            bloom.add(id_)
+            seen_max = max(seen_max, id_)
+        upper = seen_max if max_id is None else min(seen_max, max_id)
+        self._bloom, self._max_id = bloom, upper
+
+    def add(self, id_: int) -> None:
+        if self._bloom is not None:
+            self._bloom.add(id_)
+
+    def might_exist(self, id_: int) -> bool:
+        if id_ <= 0:
+            return False
+        if self._bloom is None or id_ > self._max_id - self.safety_margin:
+            return True
+        return id_ in self._bloom
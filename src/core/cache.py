@@ -1,23 +1,167 @@
-from typing import Any, Optional, Type, TypeVar
+import asyncio
+from functools import lru_cache
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
 
 from pydantic import TypeAdapter
 from redis.asyncio import Redis
 
 from src.config import settings
-from src.core.redis import get_redis_client
+from src.core import codec
+from src.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.core.metrics import CACHE_REQUESTS, track_redis
+from src.core.redis import DEFAULT_NODE, get_cache_nodes
+from src.core.sharding import RendezvousHash
+from src.core.sketch import HotKeyTracker
 
 T = TypeVar("T")
 
+# Marker untuk negative caching ("not found" juga di-cache)
+NEGATIVE_CACHE_VALUE = b"__nil__"
+
+# Frekuensi akses key per-process, dipakai CacheRefresher untuk refresh-ahead
+hot_keys = HotKeyTracker(capacity=settings.CACHE_REFRESH_TOP_N * 4)
+
+# Circuit breaker per node: satu node lambat/mati tidak mematikan node lain
+breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(node: str) -> CircuitBreaker:
+    breaker = breakers.get(node)
+    if breaker is None:
+        breaker = breakers[node] = CircuitBreaker(
+            "redis" if node == DEFAULT_NODE else f"redis:{node}",
+            failure_threshold=settings.CACHE_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.CACHE_BREAKER_RESET_TIMEOUT,
+        )
+    return breaker
+
+
+@lru_cache(maxsize=256)
+def _build_type_adapter(type_model: Hashable) -> TypeAdapter:
+    return TypeAdapter(type_model)
+
+
+def get_type_adapter(type_model: Type[T]) -> "TypeAdapter[T]":
+    """TypeAdapter di-build sekali per type (schema validator/serializer di-compile)"""
+    return _build_type_adapter(cast(Hashable, type_model))
+
+
+def _value_type(value: Any) -> Any:
+    # List[Model] punya serializer compiled; `list` polos jatuh ke inference per item
+    if isinstance(value, list) and value:
+        return List[type(value[0])]  # type: ignore[misc]
+    return type(value)
+
 
 class CacheService:
-    def __init__(self):
+    """
+    Cache di atas satu atau beberapa node Redis. Key dibagi ke node dengan
+    rendezvous hashing; operasi multi-key dikelompokkan per node dan
+    dijalankan bersamaan, invalidasi pattern di-fan out ke semua node.
+    """
+
+    def __init__(self, nodes: Optional[Mapping[str, Redis]] = None):
         self._redis: Optional[Redis] = None
+        self._nodes: Optional[Mapping[str, Redis]] = nodes
+        self._ring: Optional[RendezvousHash] = None
+
+    @property
+    def nodes(self) -> Mapping[str, Redis]:
+        if self._nodes is None:
+            # `_redis` di-set langsung: satu node (dipakai test)
+            if self._redis is not None:
+                return {DEFAULT_NODE: self._redis}
+            self._nodes = get_cache_nodes()
+        return self._nodes
 
     @property
-    def redis(self) -> Redis:
-        if not self._redis:
-            self._redis = get_redis_client()
-        return self._redis
+    def ring(self) -> RendezvousHash:
+        nodes = list(self.nodes)
+        if self._ring is None or self._ring.nodes != nodes:
+            self._ring = RendezvousHash(nodes)
+        return self._ring
+
+    def _node_for(self, key: str) -> str:
+        return self.ring.node_for(key)
+
+    @staticmethod
+    def _track(key: str) -> None:
+        if settings.CACHE_REFRESH_ENABLED:
+            hot_keys.record(key)
+
+    async def _call(
+        self,
+        operation: str,
+        node: str,
+        func: Callable[[Redis], Awaitable[T]],
+        timeout: Optional[float] = None,
+    ) -> T:
+        """
+        Jalankan satu operasi Redis di `node` dengan timeout lewat circuit breaker
+        node itu. Raise CircuitOpenError tanpa I/O kalau circuit sedang open.
+        """
+        breaker = get_breaker(node)
+        if not breaker.allow():
+            CACHE_REQUESTS.labels(operation, "short_circuit").inc()
+            raise CircuitOpenError(operation)
+        try:
+            with track_redis(operation):
+                async with asyncio.timeout(timeout or settings.CACHE_OPERATION_TIMEOUT):
+                    result = await func(self.nodes[node])
+        except asyncio.CancelledError:
+            # Cancel dari luar bukan kegagalan Redis
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return result
+
+    async def _fan_out(
+        self,
+        operation: str,
+        groups: Mapping[str, T],
+        func: Callable[[Redis, T], Awaitable[Any]],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Jalankan func per node secara bersamaan. Return {node: hasil atau exception};
+        kegagalan satu node tidak membatalkan node lain.
+        """
+
+        def bind(arg: T) -> Callable[[Redis], Awaitable[Any]]:
+            # Argumen per node di-bind di sini, bukan lewat default lambda
+            async def call(client: Redis) -> Any:
+                return await func(client, arg)
+
+            return call
+
+        nodes = list(groups)
+        results = await asyncio.gather(
+            *(
+                self._call(operation, node, bind(groups[node]), timeout=timeout)
+                for node in nodes
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+        return dict(zip(nodes, results))
 
     async def get(self, key: str, type_model: Type[T]) -> Optional[T]:
         """
@@ -27,17 +171,120 @@ class CacheService:
         if not settings.CACHE_ENABLED:
             return None
 
+        self._track(key)
         try:
-            data = await self.redis.get(key)
-            if not data:
+            data = await self._call(
+                "get", self._node_for(key), lambda client: client.get(key)
+            )
+            if not data or data == NEGATIVE_CACHE_VALUE:
+                CACHE_REQUESTS.labels("get", "miss").inc()
                 return None
 
-            adapter = TypeAdapter(type_model)
-            return adapter.validate_json(data)
+            adapter = get_type_adapter(type_model)
+            value = adapter.validate_json(codec.decode(data))
+            CACHE_REQUESTS.labels("get", "hit").inc()
+            return value
+        except CircuitOpenError:
+            return None
         except Exception:
-            # Log error ideally
+            CACHE_REQUESTS.labels("get", "error").inc()
             return None
 
+    async def get_entry(
+        self, key: str, type_model: Type[T]
+    ) -> Tuple[bool, Optional[T]]:
+        """
+        Seperti get, tapi membedakan miss dan negative hit.
+        Returns (hit, value); (True, None) berarti key ter-cache sebagai "not found".
+        """
+        if not settings.CACHE_ENABLED:
+            return False, None
+
+        self._track(key)
+        try:
+            data = await self._call(
+                "get", self._node_for(key), lambda client: client.get(key)
+            )
+            if not data:
+                CACHE_REQUESTS.labels("get", "miss").inc()
+                return False, None
+            if data == NEGATIVE_CACHE_VALUE:
+                CACHE_REQUESTS.labels("get", "negative_hit").inc()
+                return True, None
+
+            adapter = get_type_adapter(type_model)
+            value = adapter.validate_json(codec.decode(data))
+            CACHE_REQUESTS.labels("get", "hit").inc()
+            return True, value
+        except CircuitOpenError:
+            return False, None
+        except Exception:
+            CACHE_REQUESTS.labels("get", "error").inc()
+            return False, None
+
+    async def get_many(
+        self, keys: List[str], type_model: Type[T]
+    ) -> Dict[str, Optional[T]]:
+        """
+        Seperti get_entry untuk banyak key (satu MGET per node, bersamaan).
+        Return {key: value} hanya untuk key yang hit; value None berarti key
+        ter-cache sebagai "not found".
+        """
+        if not settings.CACHE_ENABLED or not keys:
+            return {}
+
+        for key in keys:
+            self._track(key)
+        groups = self.ring.group(keys)
+        results = await self._fan_out(
+            "mget", groups, lambda client, node_keys: client.mget(node_keys)
+        )
+        adapter = get_type_adapter(type_model)
+        found: Dict[str, Optional[T]] = {}
+        for node, values in results.items():
+            if isinstance(values, BaseException):
+                # Node gagal: key-nya dianggap miss, lookup tetap ke database
+                if not isinstance(values, CircuitOpenError):
+                    CACHE_REQUESTS.labels("mget", "error").inc()
+                continue
+            for key, data in zip(groups[node], values):
+                if not data:
+                    continue
+                if data == NEGATIVE_CACHE_VALUE:
+                    found[key] = None
+                    continue
+                try:
+                    found[key] = adapter.validate_json(codec.decode(data))
+                except Exception:
+                    # Payload rusak/format lama: anggap miss
+                    CACHE_REQUESTS.labels("mget", "error").inc()
+
+        negative = sum(1 for value in found.values() if value is None)
+        CACHE_REQUESTS.labels("mget", "hit").inc(len(found) - negative)
+        CACHE_REQUESTS.labels("mget", "negative_hit").inc(negative)
+        CACHE_REQUESTS.labels("mget", "miss").inc(len(keys) - len(found))
+        return found
+
+    async def set_negative(
+        self, keys: List[str], ttl: int = settings.CACHE_NEGATIVE_TTL
+    ):
+        """Cache hasil "not found" dengan TTL pendek yang terpisah"""
+        if not settings.CACHE_ENABLED or not keys:
+            return
+
+        async def pipeline(client: Redis, node_keys: List[str]):
+            async with client.pipeline(transaction=False) as pipe:
+                for key in node_keys:
+                    pipe.set(key, NEGATIVE_CACHE_VALUE, ex=ttl)
+                return await pipe.execute()
+
+        results = await self._fan_out("set_negative", self.ring.group(keys), pipeline)
+        for result in results.values():
+            if isinstance(result, CircuitOpenError):
+                continue
+            result_label = "error" if isinstance(result, BaseException) else "ok"
+            CACHE_REQUESTS.labels("set_negative", result_label).inc()
+
     async def set(self, key: str, value: Any, ttl: int = settings.CACHE_TTL):
         """
         Serialize value to JSON and save to cache with TTL.
@@ -46,37 +293,115 @@ class CacheService:
             return
 
         try:
-            # Create adapter for the specific type of value
-            adapter = TypeAdapter(type(value))
-            # export to json string
-            json_data = adapter.dump_json(value).decode("utf-8")
-            await self.redis.set(key, json_data, ex=ttl)
-        except Exception:
+            # Adapter di-cache per type; JSON bytes dibungkus envelope (kompresi)
+            json_data = get_type_adapter(_value_type(value)).dump_json(value)
+            payload = codec.encode(json_data)
+            await self._call(
+                "set",
+                self._node_for(key),
+                lambda client: client.set(key, payload, ex=ttl),
+            )
+            CACHE_REQUESTS.labels("set", "ok").inc()
+        except CircuitOpenError:
             pass
+        except Exception:
+            CACHE_REQUESTS.labels("set", "error").inc()
 
-    async def delete(self, key: str):
+    async def acquire_lock(self, key: str, ttl: int) -> bool:
+        """
+        Lock pendek (SET NX EX) di node yang sama dengan key. Tidak di-release:
+        expire sendiri setelah ttl. False kalau sudah dipegang atau Redis gagal.
+        """
         if not settings.CACHE_ENABLED:
-            return
+            return True
+
+        lock_key = f"lock:{key}"
         try:
-            await self.redis.delete(key)
+            acquired = await self._call(
+                "lock",
+                self._node_for(key),
+                lambda client: client.set(lock_key, b"1", ex=ttl, nx=True),
+            )
+            return bool(acquired)
+        except CircuitOpenError:
+            return False
         except Exception:
-            pass
+            CACHE_REQUESTS.labels("lock", "error").inc()
+            return False
+
+    async def ttl_many(self, keys: List[str]) -> List[int]:
+        """
+        TTL (detik) untuk setiap key; -2 kalau key tidak ada.
+        Key di node yang gagal dilaporkan -1 (tidak perlu di-refresh).
+        """
+        if not settings.CACHE_ENABLED or not keys:
+            return []
 
-    async def delete_pattern(self, pattern: str):
+        async def pipeline(client: Redis, node_keys: List[str]):
+            async with client.pipeline(transaction=False) as pipe:
+                for key in node_keys:
+                    pipe.ttl(key)
+                return await pipe.execute()
+
+        groups = self.ring.group(keys)
+        results = await self._fan_out("ttl", groups, pipeline)
+        ttls: Dict[str, int] = {}
+        for node, values in results.items():
+            if isinstance(values, BaseException):
+                if not isinstance(values, CircuitOpenError):
+                    CACHE_REQUESTS.labels("ttl", "error").inc()
+                values = [-1] * len(groups[node])
+            ttls.update(zip(groups[node], values))
+        return [ttls[key] for key in keys]
+
+    @staticmethod
+    def _raise_failures(operation: str, results: Dict[str, Any], strict: bool):
+        failures = [r for r in results.values() if isinstance(r, BaseException)]
+        errors = [r for r in failures if not isinstance(r, CircuitOpenError)]
+        if errors:
+            CACHE_REQUESTS.labels(operation, "error").inc(len(errors))
+        if len(failures) < len(results):
+            CACHE_REQUESTS.labels(operation, "ok").inc()
+        if failures and strict:
+            raise failures[0]
+
+    async def delete(self, *keys: str, strict: bool = False):
+        """
+        Delete satu atau lebih key, satu DEL per node.
+        strict=True: error Redis (termasuk circuit open) di node mana pun di-raise,
+        dipakai worker invalidation untuk retry.
         """
-        Delete all keys matching the pattern.
+        if not settings.CACHE_ENABLED or not keys:
+            return
+
+        results = await self._fan_out(
+            "delete",
+            self.ring.group(keys),
+            lambda client, node_keys: client.delete(*node_keys),
+        )
+        self._raise_failures("delete", results, strict)
+
+    async def delete_pattern(self, pattern: str, strict: bool = False):
+        """
+        Delete all keys matching the pattern di semua node.
         Uses SCAN to be non-blocking.
         """
         if not settings.CACHE_ENABLED:
             return
 
-        try:
+        async def scan_and_delete(client: Redis, _: None):
             cursor = 0
             while True:
-                cursor, keys = await self.redis.scan(cursor, match=pattern, count=100)
+                cursor, keys = await client.scan(cursor, match=pattern, count=100)
                 if keys:
-                    await self.redis.delete(*keys)
+                    await client.delete(*keys)
                 if cursor == 0:
                     break
-        except Exception:
-            pass
+
+        results = await self._fan_out(
+            "delete_pattern",
+            {node: None for node in self.nodes},
+            scan_and_delete,
+            timeout=settings.CACHE_PATTERN_TIMEOUT,
+        )
+        self._raise_failures("delete_pattern", results, strict)
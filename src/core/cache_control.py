@@ -0,0 +1,219 @@
+"""
+HTTP cache semantics untuk GraphQL.
+
+Type dan field diberi hint `@cacheControl(maxAge:, scope:)`. Selama eksekusi
+`CacheControlExtension` mengambil hint terkecil dari semua field yang
+di-resolve (aturan mirip Apollo):
+
+- field dengan hint memakai hint itu, dikombinasikan dengan hint type-nya
+- field yang mengembalikan object type / root field tanpa hint -> maxAge 0
+- field scalar non-root tanpa hint mengikuti parent
+- scope PRIVATE kalau ada satu saja field PRIVATE
+
+Hasilnya disimpan di context (`cache_policy`) lalu dipakai GraphQLRouter
+untuk header `Cache-Control` dan ETag.
+"""
+import hashlib
+from dataclasses import dataclass
+from enum import Enum
+from inspect import isawaitable
+from typing import Any, Iterator, Optional, Tuple
+
+import strawberry
+from graphql import (
+    GraphQLObjectType,
+    GraphQLResolveInfo,
+    get_named_type,
+    is_leaf_type,
+)
+from strawberry.extensions import SchemaExtension
+from strawberry.schema.schema_converter import GraphQLCoreConverter
+from strawberry.schema_directive import Location
+from strawberry.type import get_object_definition
+from strawberry.types.graphql import OperationType
+
+BACKREF = GraphQLCoreConverter.DEFINITION_BACKREF
+
+
+@strawberry.enum
+class CacheControlScope(Enum):
+    PUBLIC = "PUBLIC"
+    PRIVATE = "PRIVATE"
+
+
+@strawberry.schema_directive(
+    locations=[Location.OBJECT, Location.FIELD_DEFINITION], name="cacheControl"
+)
+class CacheControl:
+    max_age: Optional[int] = None
+    scope: Optional[CacheControlScope] = None
+
+
+@dataclass(frozen=True)
+class CacheHint:
+    max_age: Optional[int] = None
+    scope: Optional[CacheControlScope] = None
+
+    def merge(self, other: Optional["CacheHint"]) -> "CacheHint":
+        """Hint field menimpa hint type, PRIVATE selalu menang"""
+        if other is None:
+            return self
+        private = CacheControlScope.PRIVATE in (self.scope, other.scope)
+        return CacheHint(
+            self.max_age if self.max_age is not None else other.max_age,
+            CacheControlScope.PRIVATE if private else self.scope or other.scope,
+        )
+
+
+def _hint_from(definition: Any) -> Optional[CacheHint]:
+    for directive in getattr(definition, "directives", None) or ():
+        if isinstance(directive, CacheControl):
+            return CacheHint(directive.max_age, directive.scope)
+    return None
+
+
+class CachePolicy:
+    """Policy gabungan satu response (atau satu batch)"""
+
+    def __init__(self):
+        self.max_age: Optional[int] = None
+        self.scope = CacheControlScope.PUBLIC
+
+    def restrict(self, hint: CacheHint) -> None:
+        if hint.max_age is not None:
+            self.max_age = (
+                hint.max_age
+                if self.max_age is None
+                else min(self.max_age, hint.max_age)
+            )
+        if hint.scope == CacheControlScope.PRIVATE:
+            self.scope = CacheControlScope.PRIVATE
+
+    def uncacheable(self) -> None:
+        self.max_age = 0
+
+    def merge(self, other: "CachePolicy") -> None:
+        self.restrict(CacheHint(other.max_age, other.scope))
+        if other.max_age is None:
+            self.uncacheable()
+
+    @property
+    def cacheable(self) -> bool:
+        return bool(self.max_age)
+
+    def header(self) -> str:
+        if not self.cacheable:
+            return "no-store"
+        return f"max-age={self.max_age}, {self.scope.value.lower()}"
+
+
+# Hint statis per GraphQLField: (INHERIT|STATIC|DYNAMIC, hint), disimpan di
+# extensions field itu sendiri sehingga terikat ke schema-nya
+INHERIT, STATIC, DYNAMIC = "inherit", "static", "dynamic"
+HINT_EXTENSION = "cache_control_hint"
+StaticHint = Tuple[str, Optional[CacheHint]]
+
+
+def _static_hint(info: GraphQLResolveInfo) -> StaticHint:
+    field = info.parent_type.fields.get(info.field_name)
+    if field is None:
+        # Meta field: __typename tidak membatasi, __schema/__type tidak di-cache
+        if info.field_name == "__typename":
+            return INHERIT, None
+        return STATIC, CacheHint(0)
+
+    cached: Optional[StaticHint] = field.extensions.get(HINT_EXTENSION)
+    if cached is not None:
+        return cached
+
+    field_hint = _hint_from(field.extensions.get(BACKREF))
+    named = get_named_type(field.type)
+    is_root = info.parent_type in (info.schema.query_type, info.schema.mutation_type)
+
+    result: StaticHint
+    if is_leaf_type(named):
+        if field_hint is not None:
+            result = (STATIC, field_hint)
+        elif is_root:
+            result = (STATIC, CacheHint(0))
+        else:
+            result = (INHERIT, None)
+    elif isinstance(named, GraphQLObjectType):
+        hint = (field_hint or CacheHint()).merge(
+            _hint_from(named.extensions.get(BACKREF))
+        )
+        result = (
+            STATIC,
+            hint if hint.max_age is not None else CacheHint(0, hint.scope),
+        )
+    else:
+        # Union/interface: hint tergantung type hasil resolve
+        result = (DYNAMIC, field_hint)
+
+    field.extensions[HINT_EXTENSION] = result
+    return result
+
+
+class CacheControlExtension(SchemaExtension):
+    def on_operation(self) -> Iterator[None]:
+        self.policy = CachePolicy()
+        yield
+
+        context = self.execution_context
+        if (
+            context.errors
+            or context.graphql_document is None
+            or context.operation_type != OperationType.QUERY
+        ):
+            self.policy.uncacheable()
+
+        if isinstance(context.context, dict):
+            policy = context.context.get("cache_policy")
+            if policy is None:
+                context.context["cache_policy"] = self.policy
+            else:
+                # Batch: satu context dipakai beberapa operation
+                policy.merge(self.policy)
+
+    def resolve(self, _next, root, info: GraphQLResolveInfo, *args, **kwargs):
+        kind, hint = _static_hint(info)
+        if kind == STATIC:
+            assert hint is not None
+            self.policy.restrict(hint)
+        result = _next(root, info, *args, **kwargs)
+        if kind != DYNAMIC:
+            return result
+        if isawaitable(result):
+            return self._restrict_async(result, hint)
+        self._restrict_value(result, hint)
+        return result
+
+    async def _restrict_async(self, result: Any, hint: Optional[CacheHint]) -> Any:
+        value = await result
+        self._restrict_value(value, hint)
+        return value
+
+    def _restrict_value(self, value: Any, field_hint: Optional[CacheHint]) -> None:
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for item in values:
+            if item is None:
+                continue
+            hint = (field_hint or CacheHint()).merge(
+                _hint_from(get_object_definition(item))
+            )
+            self.policy.restrict(hint if hint.max_age is not None else CacheHint(0))
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag dari isi body response"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match memakai weak comparison (nginx gzip mengubah ETag jadi W/"...")
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
@@ -0,0 +1,102 @@
+"""
+Envelope biner untuk value cache.
+
+Format: MAGIC (1 byte) + versi (1 byte) + codec id (1 byte) + payload.
+Value kecil disimpan raw, value >= threshold dikompresi (lz4 kalau ter-install,
+fallback zlib). Data tanpa MAGIC dianggap entry lama (JSON polos), jadi entry
+yang sudah ada di Redis tetap bisa dibaca.
+"""
+import time
+import zlib
+from typing import Callable, Dict, Optional, Tuple
+
+from src.config import settings
+from src.core.metrics import CACHE_CODEC_LATENCY, CACHE_COMPRESSION_BYTES_SAVED
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4_frame = None
+
+# JSON tidak pernah diawali byte 0x00
+MAGIC = b"\x00"
+VERSION = 1
+
+RAW = 0
+ZLIB = 1
+LZ4 = 2
+
+CODEC_NAMES = {RAW: "raw", ZLIB: "zlib", LZ4: "lz4"}
+
+Codec = Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+_CODECS: Dict[int, Codec] = {
+    RAW: (lambda data: data, lambda data: data),
+    ZLIB: (
+        lambda data: zlib.compress(data, settings.CACHE_COMPRESSION_LEVEL),
+        zlib.decompress,
+    ),
+}
+if lz4_frame is not None:
+    _CODECS[LZ4] = (lz4_frame.compress, lz4_frame.decompress)
+
+
+class CodecError(ValueError):
+    """Envelope tidak dikenal (versi/codec lebih baru atau lib tidak ter-install)"""
+
+
+def default_codec() -> int:
+    if settings.CACHE_COMPRESSION_CODEC == "lz4" and LZ4 in _CODECS:
+        return LZ4
+    return ZLIB
+
+
+def _header(codec: int) -> bytes:
+    return MAGIC + bytes((VERSION, codec))
+
+
+def encode(
+    data: bytes,
+    threshold: Optional[int] = None,
+    codec: Optional[int] = None,
+) -> bytes:
+    if threshold is None:
+        threshold = settings.CACHE_COMPRESSION_THRESHOLD
+    if not settings.CACHE_COMPRESSION_ENABLED or len(data) < threshold:
+        return _header(RAW) + data
+
+    codec = default_codec() if codec is None else codec
+    compress, _ = _CODECS[codec]
+    name = CODEC_NAMES[codec]
+    start = time.perf_counter()
+    compressed = compress(data)
+    CACHE_CODEC_LATENCY.labels(name, "encode").observe(time.perf_counter() - start)
+
+    # Data yang tidak bisa dikompresi (mis. sudah acak) disimpan raw saja
+    if len(compressed) >= len(data):
+        return _header(RAW) + data
+
+    CACHE_COMPRESSION_BYTES_SAVED.labels(name).inc(len(data) - len(compressed))
+    return _header(codec) + compressed
+
+
+def decode(blob: bytes) -> bytes:
+    if not blob.startswith(MAGIC):
+        # Entry lama: JSON polos tanpa envelope
+        return blob
+    if len(blob) < 3 or blob[1] != VERSION:
+        raise CodecError("Unsupported cache envelope version")
+
+    codec = blob[2]
+    if codec == RAW:
+        return blob[3:]
+    if codec not in _CODECS:
+        raise CodecError(f"Unsupported cache codec {codec}")
+
+    _, decompress = _CODECS[codec]
+    start = time.perf_counter()
+    data = decompress(blob[3:])
+    CACHE_CODEC_LATENCY.labels(CODEC_NAMES[codec], "decode").observe(
+        time.perf_counter() - start
+    )
+    return data
@@ -1,16 +1,49 @@
-from typing import AsyncGenerator
+import asyncio
+import time
+from typing import Any, AsyncGenerator, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool, Pool, QueuePool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool
 
 from src.config import settings
+from src.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_OVERFLOW,
+)
+from src.core.profiling import install_sql_profiling
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """QueuePool yang mencatat waktu tunggu checkout dan isi pool ke Prometheus"""
+
+    def _update_gauges(self) -> None:
+        DB_POOL_CHECKED_OUT.set(self.checkedout())
+        DB_POOL_OVERFLOW.set(max(self.overflow(), 0))
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+            self._update_gauges()
+
+    def _do_return_conn(self, record):
+        # Event "checkin" jalan sebelum koneksi masuk lagi ke queue, jadi
+        # gauge baru di-refresh setelah koneksi benar-benar dikembalikan
+        try:
+            super()._do_return_conn(record)
+        finally:
+            self._update_gauges()
+
 
 # Connection pooling untuk production
 if settings.DEBUG:
     pool_class: type[Pool] = NullPool
     pool_args = {}
 else:
-    pool_class = QueuePool
+    pool_class = InstrumentedQueuePool
     pool_args = {
         "pool_size": settings.DATABASE_POOL_SIZE,
         "max_overflow": settings.DATABASE_MAX_OVERFLOW,
@@ -26,6 +59,14 @@ engine = create_async_engine(
     **pool_args
 )
 
+
+if settings.SQL_PROFILING_ENABLED:
+    install_sql_profiling(
+        engine.sync_engine,
+        slow_query_ms=settings.SQL_SLOW_QUERY_MS,
+        explain_slow=settings.SQL_EXPLAIN_SLOW_QUERIES,
+    )
+
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -46,3 +87,70 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise e
         finally:
             await session.close()
+
+
+class SharedSession:
+    """
+    Session yang di-share oleh beberapa operation GraphQL dalam satu HTTP request.
+    AsyncSession baru dibuat saat pertama dipakai, dan method async di-serialize
+    dengan lock karena AsyncSession tidak boleh dipakai concurrent.
+    """
+
+    _SERIALIZED = frozenset(
+        {
+            "execute",
+            "scalar",
+            "scalars",
+            "get",
+            "flush",
+            "refresh",
+            "commit",
+            "rollback",
+            "delete",
+            "merge",
+        }
+    )
+
+    def __init__(self):
+        self._session: Optional[AsyncSession] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = AsyncSessionLocal()
+        return self._session
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.session, name)
+        if name not in self._SERIALIZED:
+            return attr
+
+        async def serialized(*args, **kwargs):
+            async with self._lock:
+                return await attr(*args, **kwargs)
+
+        return serialized
+
+    async def finish(self, error: bool = False) -> None:
+        if self._session is None:
+            return
+        try:
+            if error:
+                await self._session.rollback()
+            else:
+                await self._session.commit()
+        finally:
+            await self._session.close()
+
+
+async def get_shared_session() -> AsyncGenerator[SharedSession, None]:
+    """Dependency untuk context GraphQL, session hanya dibuka kalau benar-benar dipakai"""
+    shared = SharedSession()
+    try:
+        yield shared
+    except Exception:
+        await shared.finish(error=True)
+        raise
+    else:
+        await shared.finish()
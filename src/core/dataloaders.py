@@ -1,9 +1,24 @@
-from typing import TYPE_CHECKING, List, Optional
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from strawberry.dataloader import DataLoader
 
+from src.config import settings
+from src.core.metrics import instrument_batch
+
 if TYPE_CHECKING:
     from src.features.users.schemas import User
 
@@ -13,45 +28,244 @@ class BaseLoader:
         self.session = session
 
 
-class UserLoader(BaseLoader):
+# (getter DataLoader tujuan, fungsi value -> key di loader itu)
+Prime = Tuple[Callable[[], DataLoader], Callable[[Any], Any]]
+
+
+class KeyedLoader(BaseLoader):
+    """
+    Loader generik `model.column IN (...)`.
+
+    Key di-dedup dan dikirim ke IN dalam bentuk ter-normalisasi (`normalize`
+    harus sama dengan cara value disimpan), lalu dipecah per `max_batch_size`
+    supaya tidak ada IN list raksasa. Kalau ada `session_factory`, chunk
+    dijalankan bersamaan dengan session masing-masing (maksimal
+    `max_concurrency` sekaligus supaya pool tidak habis); kalau tidak,
+    berurutan di session request. Setiap value yang ditemukan juga di-prime ke loader
+    lain (`primes`), mis. load by id sekaligus mengisi loader by email.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        model: Any,
+        column: str,
+        name: str,
+        filters: Sequence[Any] = (),
+        transform: Callable[[Any], Any] = lambda row: row,
+        normalize: Callable[[Any], Hashable] = lambda key: key,
+        max_batch_size: int = settings.DATALOADER_MAX_BATCH_SIZE,
+        max_concurrency: int = settings.DATALOADER_MAX_CONCURRENCY,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        primes: Sequence[Prime] = (),
+    ):
+        super().__init__(session)
+        self.model = model
+        self.column = column
+        self.name = name
+        self.filters = filters
+        self.transform = transform
+        self.normalize = normalize
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max_concurrency
+        self.session_factory = session_factory
+        self.primes = primes
+
+    async def _query(self, session: AsyncSession, keys: List[Any]) -> List[Any]:
+        result = await session.execute(
+            select(self.model)
+            .where(getattr(self.model, self.column).in_(keys))
+            .where(*self.filters)
+        )
+        return list(result.scalars().all())
+
+    async def _query_in_new_session(
+        self, keys: List[Any], semaphore: asyncio.Semaphore
+    ) -> List[Any]:
+        assert self.session_factory is not None
+        async with semaphore, self.session_factory() as session:
+            return await self._query(session, keys)
+
+    async def fetch_many(self, keys: List[Any]) -> Dict[Hashable, Any]:
+        """Return {normalize(key): transform(row)} untuk key yang ditemukan"""
+        unique = list(dict.fromkeys(self.normalize(key) for key in keys))
+        if not unique:
+            return {}
+
+        size = max(1, self.max_batch_size)
+        chunks = [unique[i : i + size] for i in range(0, len(unique), size)]
+        if len(chunks) > 1 and self.session_factory is not None:
+            semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+            results = await asyncio.gather(
+                *(self._query_in_new_session(chunk, semaphore) for chunk in chunks)
+            )
+        else:
+            results = [await self._query(self.session, chunk) for chunk in chunks]
+
+        found = {
+            self.normalize(getattr(row, self.column)): self.transform(row)
+            for rows in results
+            for row in rows
+        }
+        self.prime_related(found.values())
+        return found
+
+    def prime_related(self, values: Iterable[Any]) -> None:
+        """Prime value yang ditemukan ke loader lain (`primes`)"""
+        values = list(values)
+        for get_loader, key_fn in self.primes:
+            loader = get_loader()
+            for value in values:
+                loader.prime(key_fn(value), value)
+
+    async def load(self, keys: List[Any]) -> List[Optional[Any]]:
+        found = await self.fetch_many(keys)
+        return [found.get(self.normalize(key)) for key in keys]
+
+    def get_loader(self) -> DataLoader:
+        return DataLoader(
+            load_fn=instrument_batch(self.name, self.load),
+            cache_key_fn=self.normalize,
+        )
+
+
+def normalize_email(email: str) -> str:
+    """Email dibandingkan case-insensitive; bentuk ini yang disimpan di database"""
+    return email.strip().lower()
+
+
+class UserLoader(KeyedLoader):
     """Batch load users untuk hindari N+1 problem"""
 
-    async def load_users(self, keys: List[int]) -> List[Optional["User"]]:
-        from src.core.logging import logger
-        from src.features.users.repository import UserRepository
+    def __init__(self, session: AsyncSession, **kwargs):
+        from src.features.users.models import UserModel
+        from src.features.users.schemas import user_from_model
+
+        super().__init__(
+            session,
+            UserModel,
+            "id",
+            name="user",
+            filters=(UserModel.is_deleted.is_(False),),
+            transform=user_from_model,
+            **kwargs,
+        )
+
+    async def load(self, keys: List[int]) -> List[Optional["User"]]:
+        from src.core.cache import CacheService
         from src.features.users.schemas import User
+        from src.features.users.service import user_id_filter
+
+        # ID yang pasti tidak ada (bloom filter) tidak perlu sampai ke cache/database;
+        # user yang ter-cache (termasuk "not found") langsung dipakai dari MGET
+        cache = CacheService()
+        candidates = [key for key in keys if user_id_filter.might_exist(key)]
+        cached = await cache.get_many([f"user:{key}" for key in candidates], User)
+        to_fetch = [key for key in candidates if f"user:{key}" not in cached]
+
+        users_map: Dict[Hashable, Optional["User"]] = {
+            key: cached[f"user:{key}"] for key in candidates if f"user:{key}" in cached
+        }
+        self.prime_related(user for user in users_map.values() if user is not None)
+        fetched = await self.fetch_many(to_fetch)
+        users_map.update(fetched)
+
+        missing = [f"user:{key}" for key in to_fetch if key not in fetched]
+        await cache.set_negative(missing)
+
+        return [users_map.get(key) for key in keys]
+
 
+class FollowLoader(BaseLoader):
+    """
+    Batch load followers/following. Key = (user_id, first); semua parent dengan
+    `first` yang sama di-load dalam satu query window function, jadi query
+    bersarang butuh jumlah query konstan per level.
+    """
+
+    def __init__(self, session: AsyncSession, direction: str):
+        super().__init__(session)
+        self.direction = direction
+
+    async def load_lists(self, keys: List[Tuple[int, int]]) -> List[List["User"]]:
+        from src.features.users.repository import UserRepository
+        from src.features.users.schemas import user_from_model
 
         repo = UserRepository(self.session)
-        users_map = await repo.get_by_ids(keys)
-
-        return [
-            User(
-                id=user.id,  # type: ignore
-                name=user.name,  # type: ignore
-                email=user.email,  # type: ignore
-                is_active=user.is_active,  # type: ignore
-                created_at=user.created_at,
-                updated_at=user.updated_at,
-            )
-            if (user := users_map.get(key))
-            else None
-            for key in keys
-        ]
+        by_first: Dict[int, List[int]] = {}
+        for user_id, first in keys:
+            by_first.setdefault(first, []).append(user_id)
+
+        results: Dict[Tuple[int, int], List["User"]] = {}
+        for first, user_ids in by_first.items():
+            lists = await repo.get_follow_lists(user_ids, first, self.direction)
+            for user_id in user_ids:
+                results[(user_id, first)] = [
+                    user_from_model(user) for user in lists.get(user_id, [])
+                ]
+        return [results[key] for key in keys]
 
     def get_loader(self) -> DataLoader:
-        return DataLoader(load_fn=self.load_users)
+        return DataLoader(load_fn=instrument_batch(self.direction, self.load_lists))
 
 
 class Loaders:
     """Registry untuk semua dataloaders"""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ):
         self.session = session
+        # Dipakai untuk chunk IN list yang dijalankan bersamaan
+        self.session_factory = session_factory
         self._user_loader: Optional[DataLoader] = None
+        self._user_by_email: Optional[DataLoader] = None
+        self._followers_loader: Optional[DataLoader] = None
+        self._following_loader: Optional[DataLoader] = None
 
     @property
     def user_loader(self) -> DataLoader:
         if self._user_loader is None:
-            self._user_loader = UserLoader(self.session).get_loader()
+            self._user_loader = UserLoader(
+                self.session,
+                session_factory=self.session_factory,
+                primes=[(lambda: self.user_by_email, lambda user: user.email)],
+            ).get_loader()
         return self._user_loader
+
+    @property
+    def user_by_email(self) -> DataLoader:
+        from src.features.users.models import UserModel
+        from src.features.users.schemas import user_from_model
+
+        if self._user_by_email is None:
+            self._user_by_email = KeyedLoader(
+                self.session,
+                UserModel,
+                "email",
+                name="user_by_email",
+                filters=(UserModel.is_deleted.is_(False),),
+                transform=user_from_model,
+                normalize=normalize_email,
+                session_factory=self.session_factory,
+                primes=[(lambda: self.user_loader, lambda user: user.id)],
+            ).get_loader()
+        return self._user_by_email
+
+    @property
+    def followers_loader(self) -> DataLoader:
+        from src.features.users.repository import FOLLOWERS
+
+        if self._followers_loader is None:
+            self._followers_loader = FollowLoader(self.session, FOLLOWERS).get_loader()
+        return self._followers_loader
+
+    @property
+    def following_loader(self) -> DataLoader:
+        from src.features.users.repository import FOLLOWING
+
+        if self._following_loader is None:
+            self._following_loader = FollowLoader(self.session, FOLLOWING).get_loader()
+        return self._following_loader
@@ -2,20 +2,19 @@ from typing import Optional
 
 import strawberry
 
+# Tipe error GraphQL sengaja bukan subclass Exception: graphql-core me-raise
+# setiap Exception yang dikembalikan resolver, jadi union member tidak pernah
+# sampai ke client. Service melempar ServiceError, resolver mengembalikan
+# hasil to_graphql().
+
 
 @strawberry.interface
-class Error(Exception):
+class Error:
     """Base error interface"""
 
     message: str
     code: str
 
-    def __init__(self, message: str, code: Optional[str] = None):
-        super().__init__(message)
-        self.message = message
-        if code:
-            self.code = code
-
 
 @strawberry.type
 class NotFoundError(Error):
@@ -31,12 +30,6 @@ class ValidationError(Error):
     code: str = "VALIDATION_ERROR"
     field: Optional[str] = None
 
-    def __init__(
-        self, message: str, code: str = "VALIDATION_ERROR", field: Optional[str] = None
-    ):
-        super().__init__(message, code)
-        self.field = field
-
 
 @strawberry.type
 class AuthenticationError(Error):
@@ -58,3 +51,27 @@ class DatabaseError(Error):
     """Database error"""
 
     code: str = "DATABASE_ERROR"
+
+
+# Exceptions service layer
+class ServiceError(Exception):
+    """Base exception yang dilempar service"""
+
+    def __init__(self, message: str, field: Optional[str] = None):
+        super().__init__(message)
+        self.message = message
+        self.field = field
+
+
+class InvalidInputError(ServiceError):
+    """Input ditolak service"""
+
+    def to_graphql(self) -> ValidationError:
+        return ValidationError(message=self.message, field=self.field)
+
+
+class InvalidCredentialsError(ServiceError):
+    """Login gagal"""
+
+    def to_graphql(self) -> AuthenticationError:
+        return AuthenticationError(message=self.message)
@@ -0,0 +1,170 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Union
+
+import orjson
+from graphql import GraphQLError, OperationType, get_operation_ast, parse
+from starlette.requests import Request
+from starlette.responses import Response
+from strawberry import UNSET
+from strawberry.exceptions import MissingQueryError
+from strawberry.fastapi import GraphQLRouter as BaseGraphQLRouter
+from strawberry.http import GraphQLHTTPResponse
+from strawberry.http.exceptions import HTTPException
+from strawberry.schema.exceptions import InvalidOperationTypeError
+from strawberry.types.graphql import OperationType as StrawberryOperationType
+
+from src.core.cache_control import CachePolicy, compute_etag, etag_matches
+
+
+class GraphQLRouter(BaseGraphQLRouter):
+    """
+    GraphQLRouter dengan orjson untuk parse request dan encode response, plus
+    HTTP batching: body berupa JSON array dieksekusi dengan satu context
+    (session + Loaders) sehingga DataLoader bisa menggabungkan query antar operation.
+    Response diberi header Cache-Control dari `cache_policy` di context, dan
+    query lewat GET mendapat ETag (If-None-Match -> 304).
+    """
+
+    def __init__(self, *args, max_batch_size: int = 10, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_batch_size = max_batch_size
+
+    def parse_json(self, data: Union[str, bytes]) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as e:
+            raise HTTPException(400, "Unable to parse request body as JSON") from e
+
+    def encode_json(self, response_data: GraphQLHTTPResponse) -> bytes:  # type: ignore[override]
+        return orjson.dumps(response_data)
+
+    async def run(
+        self,
+        request: Request,
+        context: Optional[Any] = UNSET,
+        root_value: Optional[Any] = UNSET,
+    ) -> Response:
+        if request.method == "POST" and "application/json" in request.headers.get(
+            "content-type", ""
+        ):
+            # Starlette menyimpan body, jadi super().run() tetap bisa membacanya
+            body = await request.body()
+            if body.lstrip()[:1] == b"[":
+                response = await self.run_batch(
+                    request, self.parse_json(body), context, root_value
+                )
+                return self.apply_cache_headers(request, context, response)
+
+        response = await super().run(request, context=context, root_value=root_value)
+        return self.apply_cache_headers(request, context, response)
+
+    @staticmethod
+    def apply_cache_headers(
+        request: Request, context: Any, response: Response
+    ) -> Response:
+        policy: Optional[CachePolicy] = (
+            context.get("cache_policy") if isinstance(context, dict) else None
+        )
+        # Tanpa policy (mis. GraphiQL HTML atau request invalid): header default
+        if policy is None or response.status_code != 200:
+            return response
+
+        response.headers["Cache-Control"] = policy.header()
+        if request.method not in ("GET", "HEAD") or not policy.cacheable:
+            return response
+
+        etag = compute_etag(response.body)
+        response.headers["ETag"] = etag
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            return Response(
+                status_code=304,
+                headers={
+                    "ETag": etag,
+                    "Cache-Control": response.headers["Cache-Control"],
+                },
+            )
+        return response
+
+    async def run_batch(
+        self,
+        request: Request,
+        operations: List[Any],
+        context: Any,
+        root_value: Any,
+    ) -> Response:
+        if not self.max_batch_size:
+            raise HTTPException(400, "Batching is not enabled")
+        if not operations:
+            raise HTTPException(400, "Empty batch")
+        if len(operations) > self.max_batch_size:
+            raise HTTPException(
+                400, f"Batch too large, maximum is {self.max_batch_size} operations"
+            )
+
+        sub_response = await self.get_sub_response(request)
+
+        if any(self._is_mutation(operation) for operation in operations):
+            # Mutation berbagi satu transaksi: jalankan berurutan sesuai urutan batch
+            results = [
+                await self._execute_one(request, operation, context, root_value)
+                for operation in operations
+            ]
+        else:
+            results = await asyncio.gather(
+                *(
+                    self._execute_one(request, operation, context, root_value)
+                    for operation in operations
+                )
+            )
+
+        response = Response(
+            orjson.dumps(results),
+            media_type="application/json",
+            status_code=sub_response.status_code or 200,
+        )
+        response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+    @staticmethod
+    def _is_mutation(operation: Any) -> bool:
+        if not isinstance(operation, dict) or not operation.get("query"):
+            return False
+        try:
+            operation_ast = get_operation_ast(
+                parse(operation["query"]), operation.get("operationName")
+            )
+        except GraphQLError:
+            return False
+        return (
+            operation_ast is not None
+            and operation_ast.operation == OperationType.MUTATION
+        )
+
+    async def _execute_one(
+        self, request: Request, operation: Any, context: Any, root_value: Any
+    ) -> Dict[str, Any]:
+        if not isinstance(operation, dict):
+            return {"errors": [{"message": "Each batch item must be a JSON object"}]}
+
+        try:
+            result = await self.schema.execute(
+                operation.get("query"),
+                root_value=root_value,
+                variable_values=operation.get("variables"),
+                context_value=context,
+                operation_name=operation.get("operationName"),
+                allowed_operation_types={
+                    StrawberryOperationType.QUERY,
+                    StrawberryOperationType.MUTATION,
+                },
+            )
+        except InvalidOperationTypeError as e:
+            return {"errors": [{"message": e.as_http_error_reason("POST")}]}
+        except MissingQueryError:
+            return {"errors": [{"message": "No GraphQL query found in the request"}]}
+
+        response_data = await self.process_result(request=request, result=result)
+        if result.errors:
+            self._handle_errors(result.errors, response_data)
+        return dict(response_data)
@@ -0,0 +1,322 @@
+"""
+Post-commit queue untuk invalidasi cache dan side effect lain.
+
+Service mendaftarkan invalidasi dengan `after_commit(session, ...)` sebelum
+commit. Setelah transaksi benar-benar commit, hook SQLAlchemy memindahkannya
+ke `invalidation_queue`; worker di background meng-coalesce, de-duplicate
+dan retry, sehingga latency mutation tidak termasuk cleanup Redis.
+Kalau outbox diaktifkan, setiap invalidasi juga ditulis ke tabel
+`cache_outbox` dalam transaksi yang sama dan di-replay setelah crash.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import orjson
+from sqlalchemy import Column, DateTime, Integer, String, delete, event, func, select
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.core.base import Base
+from src.core.cache import CacheService
+from src.core.database import AsyncSessionLocal
+from src.core.logging import logger
+
+DELETE_KEY = "key"
+DELETE_PATTERN = "pattern"
+EVENT = "event"
+
+EventHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class CacheOutboxModel(Base):
+    __tablename__ = "cache_outbox"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(16), nullable=False)
+    target = Column(String(255), nullable=False)
+    payload = Column(String(1024), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+
+@dataclass(frozen=True)
+class Task:
+    kind: str
+    target: str
+    payload: Optional[str] = None  # event payload, JSON
+
+    @classmethod
+    def from_outbox(cls, row: CacheOutboxModel) -> "Task":
+        return cls(row.kind, row.target, row.payload)  # type: ignore[arg-type]
+
+
+@dataclass
+class _Pending:
+    attempts: int = 0
+    outbox_ids: Set[int] = field(default_factory=set)
+    # Handler event yang sudah sukses, tidak dijalankan ulang saat retry
+    done_handlers: Set[EventHandler] = field(default_factory=set)
+
+    def merge(self, other: "_Pending") -> None:
+        self.attempts = max(self.attempts, other.attempts)
+        self.outbox_ids |= other.outbox_ids
+        # Event baru yang identik belum menjalankan handler apa pun
+        self.done_handlers &= other.done_handlers
+
+
+class InvalidationQueue:
+    def __init__(
+        self,
+        cache: Optional[CacheService] = None,
+        coalesce_ms: int = settings.INVALIDATION_COALESCE_MS,
+        max_retries: int = settings.INVALIDATION_MAX_RETRIES,
+        retry_base: float = settings.INVALIDATION_RETRY_BASE,
+    ):
+        self.cache = cache or CacheService()
+        self.coalesce = coalesce_ms / 1000
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self._pending: Dict[Task, _Pending] = {}
+        # Retry yang menunggu backoff: worker tetap memproses task baru
+        self._delayed: Dict[Task, Tuple[asyncio.TimerHandle, _Pending]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._drain_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+        self._handlers: Dict[str, List[EventHandler]] = {}
+
+    def on(self, event_name: str, handler: EventHandler) -> None:
+        self._handlers.setdefault(event_name, []).append(handler)
+
+    def has_handlers(self, event_name: str) -> bool:
+        return bool(self._handlers.get(event_name))
+
+    def enqueue(self, tasks: Iterable[Task], outbox_ids: Iterable[int] = ()) -> None:
+        # Task yang sama (key/pattern/event identik) di-merge: de-duplication
+        ids = set(outbox_ids)
+        for task in tasks:
+            pending = self._pending.setdefault(task, _Pending())
+            pending.outbox_ids |= ids
+        self._ensure_worker()
+        assert self._wakeup is not None
+        self._wakeup.set()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._drain_lock = asyncio.Lock()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    def start(self) -> None:
+        self._ensure_worker()
+
+    async def stop(self) -> None:
+        """
+        Flush sisa task, termasuk retry yang masih menunggu backoff, lalu
+        hentikan worker. Task yang tetap gagal di-log (outbox row, kalau ada,
+        tetap tersimpan untuk replay).
+        """
+        self._stopping = True
+        try:
+            for task in list(self._delayed):
+                handle, _ = self._delayed[task]
+                handle.cancel()
+                self._requeue(task)
+            if self._pending:
+                await self.drain()
+            if self._worker is not None:
+                self._worker.cancel()
+                await asyncio.gather(self._worker, return_exceptions=True)
+                self._worker = None
+        finally:
+            self._stopping = False
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            await self._wakeup.wait()
+            # Tunggu sebentar supaya burst mutation ter-coalesce jadi satu batch
+            if self.coalesce:
+                await asyncio.sleep(self.coalesce)
+            self._wakeup.clear()
+            try:
+                await self.drain()
+            except Exception as e:
+                logger.error("invalidation_worker_error", error=str(e))
+
+    async def drain(self) -> None:
+        # Lock: stop() menunggu batch yang sedang diproses worker selesai
+        if self._drain_lock is None:
+            self._drain_lock = asyncio.Lock()
+        async with self._drain_lock:
+            batch, self._pending = self._pending, {}
+            if not batch:
+                return
+            failed = await self._process(batch)
+
+        for task, pending in failed.items():
+            pending.attempts += 1
+            if pending.attempts > self.max_retries or self._stopping:
+                # Outbox row (kalau ada) tetap tersimpan dan di-replay nanti
+                logger.error("invalidation_dropped", kind=task.kind, target=task.target)
+            else:
+                self._schedule_retry(task, pending)
+
+    def _schedule_retry(self, task: Task, pending: _Pending) -> None:
+        """Backoff per task lewat call_later, bukan sleep di worker"""
+        if task in self._delayed:
+            handle, delayed = self._delayed[task]
+            delayed.merge(pending)
+            return
+        delay = self.retry_base * 2 ** (pending.attempts - 1)
+        handle = asyncio.get_running_loop().call_later(delay, self._requeue, task)
+        self._delayed[task] = (handle, pending)
+
+    def _requeue(self, task: Task) -> None:
+        _, pending = self._delayed.pop(task)
+        current = self._pending.get(task)
+        if current is None:
+            self._pending[task] = pending
+        else:
+            current.merge(pending)
+        self._ensure_worker()
+        assert self._wakeup is not None
+        self._wakeup.set()
+
+    async def _process(self, batch: Dict[Task, _Pending]) -> Dict[Task, _Pending]:
+        failed: Dict[Task, _Pending] = {}
+        done_ids: Set[int] = set()
+
+        keys = [task for task in batch if task.kind == DELETE_KEY]
+        if keys:
+            try:
+                await self.cache.delete(*(task.target for task in keys), strict=True)
+                for task in keys:
+                    done_ids |= batch[task].outbox_ids
+            except Exception as e:
+                logger.warning("invalidation_failed", kind=DELETE_KEY, error=str(e))
+                failed.update({task: batch[task] for task in keys})
+
+        for task, pending in batch.items():
+            if task.kind == DELETE_KEY:
+                continue
+            try:
+                if task.kind == DELETE_PATTERN:
+                    await self.cache.delete_pattern(task.target, strict=True)
+                elif task.kind == EVENT:
+                    await self._run_handlers(task, pending)
+                done_ids |= pending.outbox_ids
+            except Exception as e:
+                logger.warning(
+                    "invalidation_failed",
+                    kind=task.kind,
+                    target=task.target,
+                    error=str(e),
+                )
+                failed[task] = pending
+
+        # Outbox row hanya dihapus kalau semua task dari row itu sudah sukses
+        still_pending = set().union(*(p.outbox_ids for p in failed.values()))
+        if settings.INVALIDATION_OUTBOX_ENABLED and done_ids - still_pending:
+            try:
+                await _delete_outbox_rows(done_ids - still_pending)
+            except Exception as e:
+                # Row tertinggal akan di-replay; invalidasi bersifat idempotent
+                logger.warning("outbox_cleanup_failed", error=str(e))
+        return failed
+
+    async def _run_handlers(self, task: Task, pending: _Pending) -> None:
+        """Jalankan handler yang belum sukses; raise error pertama setelah semua dicoba"""
+        payload = orjson.loads(task.payload) if task.payload else {}
+        error: Optional[Exception] = None
+        for handler in self._handlers.get(task.target, []):
+            if handler in pending.done_handlers:
+                continue
+            try:
+                await handler(payload)
+                pending.done_handlers.add(handler)
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
+
+
+invalidation_queue = InvalidationQueue()
+
+
+def after_commit(
+    session: Any,
+    keys: Iterable[str] = (),
+    patterns: Iterable[str] = (),
+    events: Iterable[Tuple[str, Dict[str, Any]]] = (),
+) -> None:
+    """
+    Daftarkan invalidasi/event untuk dijalankan setelah transaksi session commit.
+    Dibuang kalau transaksi di-rollback.
+    """
+    tasks = [Task(DELETE_KEY, key) for key in keys]
+    tasks += [Task(DELETE_PATTERN, pattern) for pattern in patterns]
+    # Event tanpa handler tidak di-queue dan tidak menulis outbox row
+    tasks += [
+        Task(EVENT, name, orjson.dumps(payload, option=orjson.OPT_SORT_KEYS).decode())
+        for name, payload in events
+        if invalidation_queue.has_handlers(name)
+    ]
+    session.info.setdefault("post_commit", []).extend(tasks)
+
+    if settings.INVALIDATION_OUTBOX_ENABLED:
+        rows = [
+            CacheOutboxModel(kind=task.kind, target=task.target, payload=task.payload)
+            for task in tasks
+        ]
+        session.add_all(rows)
+        session.info.setdefault("post_commit_outbox", []).extend(rows)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_post_commit(session: Session) -> None:
+    tasks = session.info.pop("post_commit", None)
+    rows = session.info.pop("post_commit_outbox", [])
+    if not tasks:
+        return
+    try:
+        invalidation_queue.enqueue(tasks, outbox_ids=[row.id for row in rows])
+    except RuntimeError:
+        # Commit di luar event loop (script sync): tidak ada worker
+        logger.warning("post_commit_without_event_loop", tasks=len(tasks))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_post_commit(session: Session) -> None:
+    session.info.pop("post_commit", None)
+    session.info.pop("post_commit_outbox", None)
+
+
+async def _delete_outbox_rows(ids: Set[int]) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            delete(CacheOutboxModel).where(CacheOutboxModel.id.in_(ids))
+        )
+        await session.commit()
+
+
+async def replay_outbox(batch_size: int = 500) -> int:
+    """Replay invalidasi yang tertinggal di outbox (mis. proses crash setelah commit)"""
+    async with AsyncSessionLocal() as session:
+        # NOW() server, sama dengan yang menulis created_at (naive, zona server)
+        now = (await session.execute(select(func.now()))).scalar_one()
+        cutoff = now - timedelta(seconds=settings.INVALIDATION_OUTBOX_GRACE)
+        result = await session.execute(
+            select(CacheOutboxModel)
+            .where(CacheOutboxModel.created_at < cutoff)
+            .order_by(CacheOutboxModel.id)
+            .limit(batch_size)
+        )
+        rows = list(result.scalars().all())
+
+    for row in rows:
+        invalidation_queue.enqueue([Task.from_outbox(row)], outbox_ids=[row.id])  # type: ignore[list-item]
+    if rows:
+        logger.info("outbox_replayed", count=len(rows))
+    return len(rows)
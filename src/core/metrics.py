@@ -0,0 +1,126 @@
+"""
+Prometheus metrics untuk DB pool, cache dan DataLoader.
+
+Aman untuk multi-worker uvicorn: kalau PROMETHEUS_MULTIPROC_DIR di-set,
+prometheus_client menulis ke mmap file per-process dan Instrumentator
+meng-aggregate semuanya di /metrics.
+"""
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Awaitable, Callable, Iterator, List, TypeVar
+
+from prometheus_client import Counter, Gauge, Histogram
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Database pool
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Overflow connections currently open beyond pool_size",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    buckets=LATENCY_BUCKETS,
+)
+
+# Cache
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "CacheService calls by operation and result",
+    # result: hit, miss, negative_hit, ok, error, short_circuit
+    ["operation", "result"],
+)
+REDIS_OPERATION_LATENCY = Histogram(
+    "redis_operation_seconds",
+    "Redis round-trip latency per CacheService operation",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# Kompresi payload cache
+CACHE_COMPRESSION_BYTES_SAVED = Counter(
+    "cache_compression_bytes_saved_total",
+    "Bytes saved by compressing cache values (raw size - stored size)",
+    ["codec"],
+)
+CACHE_CODEC_LATENCY = Histogram(
+    "cache_codec_seconds",
+    "Time spent encoding/decoding cache envelopes",
+    ["codec", "operation"],  # operation: encode, decode
+    buckets=(0.00001, 0.00005, 0.0001, 0.00025) + LATENCY_BUCKETS,
+)
+
+# Circuit breaker (0=closed, 1=open, 2=half_open)
+CIRCUIT_BREAKER_STATE = Gauge(
+    "circuit_breaker_state",
+    "Current circuit breaker state (0=closed, 1=open, 2=half_open)",
+    ["name"],
+    multiprocess_mode="livemax",
+)
+CIRCUIT_BREAKER_TRANSITIONS = Counter(
+    "circuit_breaker_transitions_total",
+    "Circuit breaker state transitions",
+    ["name", "state"],
+)
+
+# DataLoader
+DATALOADER_BATCH_SIZE = Histogram(
+    "dataloader_batch_size",
+    "Number of keys per DataLoader batch",
+    ["loader"],
+    buckets=BATCH_SIZE_BUCKETS,
+)
+DATALOADER_BATCH_LATENCY = Histogram(
+    "dataloader_batch_seconds",
+    "Time to resolve one DataLoader batch",
+    ["loader"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+@contextmanager
+def track_redis(operation: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        REDIS_OPERATION_LATENCY.labels(operation).observe(time.perf_counter() - start)
+
+
+def instrument_batch(
+    loader: str, load_fn: Callable[[List[K]], Awaitable[List[V]]]
+) -> Callable[[List[K]], Awaitable[List[V]]]:
+    batch_size = DATALOADER_BATCH_SIZE.labels(loader)
+    batch_latency = DATALOADER_BATCH_LATENCY.labels(loader)
+
+    @wraps(load_fn)
+    async def wrapper(keys: List[K]) -> List[V]:
+        batch_size.observe(len(keys))
+        start = time.perf_counter()
+        try:
+            return await load_fn(keys)
+        finally:
+            batch_latency.observe(time.perf_counter() - start)
+
+    return wrapper
+
+
+def mark_process_dead() -> None:
+    """Bersihkan live gauges worker ini saat shutdown (multiprocess mode)"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(os.getpid())
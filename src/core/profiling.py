@@ -0,0 +1,191 @@
+"""
+SQL profiling: aggregate statement per fingerprint, log slow query + EXPLAIN,
+dan (debug only) daftar statement per request di `extensions.sql`.
+"""
+import re
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from strawberry.extensions import SchemaExtension
+
+from src.core.logging import logger
+
+MAX_FINGERPRINTS = 500
+SAMPLES_PER_FINGERPRINT = 512
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|:\w+|\?")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalisasi SQL: literal & parameter jadi ?, IN list di-collapse"""
+    sql = _COMMENT_RE.sub(" ", statement)
+    sql = _STRING_RE.sub("?", sql)
+    sql = _PARAM_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+@dataclass
+class StatementStats:
+    count: int = 0
+    total: float = 0.0
+    samples: Deque[float] = field(
+        default_factory=lambda: deque(maxlen=SAMPLES_PER_FINGERPRINT)
+    )
+
+    def record(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.samples.append(duration)
+
+    @property
+    def p99(self) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+class QueryStats:
+    """Aggregate per-process, di-bound ke MAX_FINGERPRINTS fingerprint"""
+
+    def __init__(self):
+        self._stats: Dict[str, StatementStats] = {}
+
+    def record(self, key: str, duration: float) -> None:
+        stats = self._stats.get(key)
+        if stats is None:
+            if len(self._stats) >= MAX_FINGERPRINTS:
+                return
+            stats = self._stats[key] = StatementStats()
+        stats.record(duration)
+
+    def snapshot(self, limit: int = 50) -> List[Dict[str, Any]]:
+        ranked = sorted(self._stats.items(), key=lambda kv: kv[1].total, reverse=True)
+        return [
+            {
+                "fingerprint": key,
+                "count": stats.count,
+                "totalMs": round(stats.total * 1000, 3),
+                "p99Ms": round(stats.p99 * 1000, 3),
+            }
+            for key, stats in ranked[:limit]
+        ]
+
+    def reset(self) -> None:
+        self._stats.clear()
+
+
+query_stats = QueryStats()
+
+# Statement per request (diisi kalau SQLProfilingExtension aktif)
+_request_statements: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar(
+    "request_statements", default=None
+)
+
+
+def _explain(conn, statement: str, parameters: Any) -> Optional[List[Any]]:
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    # Raw DBAPI cursor: tidak memicu event lagi dan tidak mengganggu result asli
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return [tuple(row) for row in cursor.fetchall()]
+    except Exception as e:
+        logger.debug("sql_explain_failed", error=str(e))
+        return None
+    finally:
+        cursor.close()
+
+
+def install_sql_profiling(
+    engine: Engine, slow_query_ms: float, explain_slow: bool = True
+) -> None:
+    """Pasang before/after_cursor_execute listener di (sync) engine"""
+    threshold = slow_query_ms / 1000
+
+    # Start time per cursor; key dibuang di _after atau _error
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", {})[id(cursor)] = time.perf_counter()
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        # Statement yang raise tidak sampai ke _after; tanpa ini dict di koneksi
+        # pooled terus bertambah. ExceptionContext.cursor tidak di-set oleh
+        # SQLAlchemy 2.0, jadi cursor diambil dari execution context
+        conn = exception_context.connection
+        cursor = getattr(exception_context.execution_context, "cursor", None)
+        if conn is not None and cursor is not None:
+            conn.info.get("query_start", {}).pop(id(cursor), None)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start"].pop(id(cursor))
+        key = fingerprint(statement)
+        query_stats.record(key, duration)
+
+        statements = _request_statements.get()
+        if statements is not None:
+            statements.append(
+                {
+                    "sql": statement,
+                    "fingerprint": key,
+                    "durationMs": round(duration * 1000, 3),
+                }
+            )
+
+        if duration < threshold:
+            return
+
+        plan = None
+        is_select = statement.lstrip()[:6].upper() == "SELECT"
+        # Server-side cursor (stream_results) belum di-fetch, jangan kirim query lain
+        streaming = context is not None and context.execution_options.get(
+            "stream_results", False
+        )
+        if explain_slow and is_select and not executemany and not streaming:
+            plan = _explain(conn, statement, parameters)
+
+        logger.warning(
+            "slow_query",
+            duration_ms=round(duration * 1000, 3),
+            fingerprint=key,
+            statement=statement,
+            explain=plan,
+        )
+
+
+class SQLProfilingExtension(SchemaExtension):
+    """Debug only: tambahkan statement SQL + timing ke `extensions.sql`"""
+
+    def on_operation(self) -> Iterator[None]:
+        self._statements: List[Dict[str, Any]] = []
+        token = _request_statements.set(self._statements)
+        try:
+            yield
+        finally:
+            _request_statements.reset(token)
+
+    def get_results(self) -> Dict[str, Any]:
+        counts = Counter(s["fingerprint"] for s in self._statements)
+        return {
+            "sql": {
+                "count": len(self._statements),
+                "totalMs": round(sum(s["durationMs"] for s in self._statements), 3),
+                "statements": self._statements,
+                # Fingerprint yang muncul berkali-kali: kandidat N+1
+                "repeated": {key: n for key, n in counts.items() if n > 1},
+            }
+        }
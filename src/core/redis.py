@@ -1,16 +1,159 @@
+import fnmatch
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
 import redis.asyncio as redis
 
 from src.config import settings
+from src.core.sharding import node_name
 
 _redis_client = None
+_cache_nodes: Optional[Dict[str, Any]] = None
+
+# Nama node kalau cache hanya memakai REDIS_URL
+DEFAULT_NODE = "default"
+
+MEMORY_URL_PREFIX = "memory://"
+
+
+class InMemoryRedis:
+    """
+    Stand-in Redis in-process untuk test dan load test (REDIS_URL=memory://).
+    Hanya subset command yang dipakai CacheService, value disimpan sebagai bytes.
+    """
+
+    def __init__(self):
+        self._data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+
+    @staticmethod
+    def _key(key: Union[str, bytes]) -> bytes:
+        return key if isinstance(key, bytes) else key.encode()
+
+    @staticmethod
+    def _value(value: Any) -> bytes:
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode()
+
+    def _lookup(self, key: Union[str, bytes]) -> Optional[bytes]:
+        item = self._data.get(self._key(key))
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[self._key(key)]
+            return None
+        return value
+
+    async def get(self, key):
+        return self._lookup(key)
+
+    async def mget(self, keys, *args):
+        if isinstance(keys, (str, bytes)):
+            keys = [keys, *args]
+        return [self._lookup(key) for key in keys]
+
+    async def set(self, key, value, ex: Optional[int] = None, nx: bool = False):
+        if nx and self._lookup(key) is not None:
+            return None
+        expires_at = time.monotonic() + ex if ex else None
+        self._data[self._key(key)] = (self._value(value), expires_at)
+        return True
+
+    async def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            if self._data.pop(self._key(key), None) is not None:
+                removed += 1
+        return removed
+
+    async def ttl(self, key) -> int:
+        if self._lookup(key) is None:
+            return -2
+        _, expires_at = self._data[self._key(key)]
+        if expires_at is None:
+            return -1
+        return max(0, int(expires_at - time.monotonic()))
+
+    async def scan(self, cursor: int = 0, match: Optional[str] = None, count=None):
+        # Satu putaran: semua key dikembalikan, cursor 0 = selesai
+        keys = [
+            key
+            for key in list(self._data)
+            if self._lookup(key) is not None
+            and (match is None or fnmatch.fnmatchcase(key.decode(), match))
+        ]
+        return 0, keys
+
+    async def flushdb(self):
+        self._data.clear()
+        return True
+
+    async def aclose(self):
+        return None
+
+    def pipeline(self, transaction: bool = True) -> "InMemoryPipeline":
+        return InMemoryPipeline(self)
+
+
+class InMemoryPipeline:
+    def __init__(self, client: InMemoryRedis):
+        self._client = client
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self) -> List[Any]:
+        commands, self._commands = self._commands, []
+        return [
+            await getattr(self._client, name)(*args, **kwargs)
+            for name, args, kwargs in commands
+        ]
+
+    async def __aenter__(self) -> "InMemoryPipeline":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._commands = []
+
+
+def create_redis_client(url: str) -> Any:
+    if url.startswith(MEMORY_URL_PREFIX):
+        return InMemoryRedis()
+    # Cache bekerja dengan bytes (JSON dari pydantic/orjson) tanpa decode ke str
+    return redis.from_url(
+        url,
+        decode_responses=False,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+    )
 
 
 def get_redis_client() -> redis.Redis:
     global _redis_client
     if _redis_client is None:
-        _redis_client = redis.from_url(
-            settings.REDIS_URL,
-            encoding="utf-8",
-            decode_responses=True,
-        )
+        _redis_client = create_redis_client(settings.REDIS_URL)
     return _redis_client
+
+
+def get_cache_nodes() -> Dict[str, Any]:
+    """
+    Client per node cache dari CACHE_REDIS_URLS. Tanpa CACHE_REDIS_URLS cache
+    memakai client REDIS_URL yang sama dengan komponen lain.
+    """
+    global _cache_nodes
+    if _cache_nodes is None:
+        urls = [url.strip() for url in settings.CACHE_REDIS_URLS.split(",")]
+        urls = [url for url in urls if url]
+        if not urls:
+            _cache_nodes = {DEFAULT_NODE: get_redis_client()}
+        else:
+            _cache_nodes = {node_name(url): create_redis_client(url) for url in urls}
+            if len(_cache_nodes) != len(urls):
+                raise ValueError("CACHE_REDIS_URLS contains duplicate nodes")
+    return _cache_nodes
@@ -0,0 +1,79 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import CacheService, hot_keys
+from src.core.database import AsyncSessionLocal
+from src.core.logging import logger
+
+# Recompute value untuk key lalu tulis ulang ke cache
+RefreshFunc = Callable[[AsyncSession, str], Awaitable[object]]
+
+
+class CacheRefresher:
+    """
+    Refresh-ahead: isi ulang hot keys sebelum expire, di luar request path.
+    Setiap worker punya hot key sendiri; dengan lock_ttl > 0 hanya worker yang
+    dapat lock Redis per key yang me-refresh, jadi beban DB tidak dikali
+    jumlah worker.
+    """
+
+    def __init__(
+        self,
+        cache: CacheService,
+        top_n: int,
+        refresh_ahead: int,
+        concurrency: int,
+        lock_ttl: int = 0,
+    ):
+        self.cache = cache
+        self.top_n = top_n
+        self.refresh_ahead = refresh_ahead
+        self.lock_ttl = lock_ttl
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._refreshers: Dict[str, RefreshFunc] = {}
+
+    def register(self, prefix: str, func: RefreshFunc) -> None:
+        self._refreshers[prefix] = func
+
+    def _refresher_for(self, key: str):
+        for prefix, func in self._refreshers.items():
+            if key.startswith(prefix):
+                return func
+        return None
+
+    async def due_keys(self) -> List[str]:
+        keys = [key for key in hot_keys.top(self.top_n) if self._refresher_for(key)]
+        ttls = await self.cache.ttl_many(keys)
+        # -2: key sudah expire/di-invalidate, tapi masih hot
+        return [
+            key
+            for key, ttl in zip(keys, ttls)
+            if ttl == -2 or 0 <= ttl <= self.refresh_ahead
+        ]
+
+    async def _refresh(self, key: str) -> None:
+        func = self._refresher_for(key)
+        if func is None:
+            return
+
+        async with self._semaphore:
+            if self.lock_ttl and not await self.cache.acquire_lock(
+                f"refresh:{key}", self.lock_ttl
+            ):
+                return
+            try:
+                async with AsyncSessionLocal() as session:
+                    await func(session, key)
+            except Exception as e:
+                logger.warning("cache_refresh_failed", key=key, error=str(e))
+
+    async def run_once(self) -> None:
+        keys = await self.due_keys()
+        hot_keys.decay()
+        if not keys:
+            return
+
+        await asyncio.gather(*(self._refresh(key) for key in keys))
+        logger.debug("cache_refreshed", count=len(keys))
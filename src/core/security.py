@@ -13,8 +13,12 @@ __all__ = [
 
 from src.config import settings
 
-# Redis client untuk rate limiting
-redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+# Redis client untuk rate limiting (tidak ada kalau pakai stand-in memory://)
+redis_client = (
+    None
+    if settings.REDIS_URL.startswith("memory://")
+    else redis.from_url(settings.REDIS_URL, decode_responses=True)
+)
 
 limiter = Limiter(
     key_func=get_remote_address,
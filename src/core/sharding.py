@@ -0,0 +1,43 @@
+"""
+Rendezvous (highest random weight) hashing untuk membagi key cache ke
+beberapa node Redis. Setiap key dipetakan ke node dengan skor hash(node, key)
+tertinggi; menambah node hanya memindahkan ~1/N key (ke node baru saja),
+menghapus node hanya memindahkan key milik node itu.
+"""
+import hashlib
+from typing import Dict, Iterable, List, Sequence
+from urllib.parse import urlsplit
+
+
+def _score(node: bytes, key: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8, key=node).digest(), "big")
+
+
+class RendezvousHash:
+    def __init__(self, nodes: Sequence[str]):
+        if not nodes:
+            raise ValueError("RendezvousHash needs at least one node")
+        self.nodes = list(nodes)
+        self._encoded = [(node, node.encode()[:64]) for node in self.nodes]
+
+    def node_for(self, key: str) -> str:
+        if len(self._encoded) == 1:
+            return self.nodes[0]
+        encoded = key.encode()
+        return max(self._encoded, key=lambda item: _score(item[1], encoded))[0]
+
+    def group(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """Kelompokkan key per node, urutan key di dalam node dipertahankan"""
+        groups: Dict[str, List[str]] = {}
+        for key in keys:
+            groups.setdefault(self.node_for(key), []).append(key)
+        return groups
+
+
+def node_name(url: str) -> str:
+    """Nama node yang stabil dan aman untuk label metric (tanpa password)"""
+    parts = urlsplit(url)
+    if not parts.hostname:
+        return url
+    name = parts.hostname + (f":{parts.port}" if parts.port else "")
+    return name + parts.path if parts.path not in ("", "/") else name
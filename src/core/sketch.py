@@ -0,0 +1,81 @@
+import hashlib
+import heapq
+from typing import Dict, List, Tuple
+
+
+class CountMinSketch:
+    """Approximate frequency counter dengan memory tetap (width x depth)"""
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self._rows = [[0] * width for _ in range(depth)]
+
+    def _indexes(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=8 * self.depth).digest()
+        return [
+            int.from_bytes(digest[i * 8 : (i + 1) * 8], "little") % self.width
+            for i in range(self.depth)
+        ]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Tambah counter key, return estimasi frekuensi terbaru"""
+        estimate = None
+        for row, index in zip(self._rows, self._indexes(key)):
+            row[index] += count
+            if estimate is None or row[index] < estimate:
+                estimate = row[index]
+        return estimate or 0
+
+    def estimate(self, key: str) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def decay(self) -> None:
+        """Halve semua counter supaya frekuensi lama memudar"""
+        for row in self._rows:
+            for i, value in enumerate(row):
+                row[i] = value >> 1
+
+
+class HotKeyTracker:
+    """
+    Lacak key yang paling sering diakses (count-min sketch + kandidat terbatas).
+    Kandidat terdingin dicari lewat min-heap dengan entry lazy (entry yang
+    count-nya sudah berubah dilewati), jadi record tetap O(log n) saat penuh.
+    """
+
+    def __init__(self, capacity: int = 200, width: int = 2048, depth: int = 4):
+        self.capacity = capacity
+        self.sketch = CountMinSketch(width, depth)
+        self._candidates: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []
+
+    def record(self, key: str) -> None:
+        count = self.sketch.add(key)
+        self._candidates[key] = count
+        heapq.heappush(self._heap, (count, key))
+        if len(self._candidates) > self.capacity:
+            self._evict_coldest()
+        if len(self._heap) > self.capacity * 4:
+            self._rebuild_heap()
+
+    def _evict_coldest(self) -> None:
+        while self._heap:
+            count, key = heapq.heappop(self._heap)
+            if self._candidates.get(key) == count:
+                del self._candidates[key]
+                return
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(count, key) for key, count in self._candidates.items()]
+        heapq.heapify(self._heap)
+
+    def top(self, n: int) -> List[str]:
+        return heapq.nlargest(n, self._candidates, key=self._candidates.__getitem__)
+
+    def decay(self) -> None:
+        self.sketch.decay()
+        self._candidates = {
+            key: count >> 1 for key, count in self._candidates.items() if count > 1
+        }
+        self._rebuild_heap()
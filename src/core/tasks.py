@@ -0,0 +1,30 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from src.core.logging import logger
+
+
+async def run_periodically(
+    name: str,
+    func: Callable[[], Awaitable[object]],
+    interval: float,
+    run_immediately: bool = True,
+) -> None:
+    """Jalankan func setiap interval detik sampai task di-cancel"""
+    if not run_immediately:
+        await asyncio.sleep(interval)
+
+    while True:
+        try:
+            await func()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("periodic_task_error", task=name, error=str(e))
+        await asyncio.sleep(interval)
+
+
+async def cancel_tasks(tasks: list[asyncio.Task]) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
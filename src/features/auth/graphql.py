@@ -0,0 +1,67 @@
+from typing import Optional
+
+import strawberry
+from pydantic import ValidationError as PydanticValidationError
+from strawberry.types import Info
+
+from src.core.cache_control import CacheControl, CacheControlScope
+from src.core.exceptions import (
+    AuthenticationError,
+    InvalidCredentialsError,
+    InvalidInputError,
+    ValidationError,
+)
+from src.core.logging import logger
+from src.features.auth.schemas import AuthResponse, LoginInput, RegisterInput
+from src.features.auth.service import AuthService
+from src.features.users.schemas import User
+
+
+@strawberry.type
+class AuthQuery:
+    # Tergantung token: hanya boleh di-cache oleh browser user itu sendiri
+    @strawberry.field(directives=[CacheControl(scope=CacheControlScope.PRIVATE)])
+    async def me(self, info: Info) -> Optional[User]:
+        user_id = info.context["auth"].user_id
+        if user_id is None:
+            return None
+        return await info.context["loaders"].user_loader.load(user_id)
+
+
+@strawberry.type
+class AuthMutation:
+    @strawberry.mutation
+    async def register(self, info: Info, input: RegisterInput) -> AuthResponse:
+        session = info.context["session"]
+        service = AuthService(session, info.context["loaders"])
+
+        try:
+            return await service.register(input.validate())
+        except PydanticValidationError as e:
+            error = e.errors()[0]
+            return ValidationError(
+                message=error["msg"],
+                field=str(error["loc"][0]) if error["loc"] else None,
+            )
+        except ValueError as e:
+            return ValidationError(message=str(e), field="email")
+        except InvalidInputError as e:
+            return e.to_graphql()
+        except Exception as e:
+            logger.error("register_error", error=str(e))
+            return ValidationError(message="Internal error", field=None)
+
+    @strawberry.mutation
+    async def login(self, info: Info, input: LoginInput) -> AuthResponse:
+        session = info.context["session"]
+        service = AuthService(session, info.context["loaders"])
+
+        try:
+            return await service.login(input.validate())
+        except PydanticValidationError:
+            return AuthenticationError(message="Invalid email or password")
+        except InvalidCredentialsError as e:
+            return e.to_graphql()
+        except Exception as e:
+            logger.error("login_error", error=str(e))
+            return ValidationError(message="Internal error", field=None)
@@ -0,0 +1,52 @@
+from typing import Union
+
+import strawberry
+from pydantic import BaseModel, EmailStr, Field
+
+from src.core.exceptions import AuthenticationError, ValidationError
+from src.features.users.schemas import User
+
+
+# Pydantic untuk validation
+class RegisterInputValidation(BaseModel):
+    name: str = Field(..., min_length=2, max_length=100)
+    email: EmailStr
+    # bcrypt hanya memakai 72 byte pertama
+    password: str = Field(..., min_length=8, max_length=72)
+
+
+class LoginInputValidation(BaseModel):
+    email: EmailStr
+    password: str = Field(..., min_length=1, max_length=72)
+
+
+# Strawberry types
+@strawberry.type
+class AuthPayload:
+    access_token: str
+    token_type: str
+    user: User
+
+
+AuthResponse = Union[AuthPayload, ValidationError, AuthenticationError]
+
+
+@strawberry.input
+class RegisterInput:
+    name: str
+    email: str
+    password: str
+
+    def validate(self) -> RegisterInputValidation:
+        return RegisterInputValidation(
+            name=self.name, email=self.email, password=self.password
+        )
+
+
+@strawberry.input
+class LoginInput:
+    email: str
+    password: str
+
+    def validate(self) -> LoginInputValidation:
+        return LoginInputValidation(email=self.email, password=self.password)
@@ -0,0 +1,64 @@
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.auth import (
+    create_access_token,
+    dummy_password_hash,
+    hash_password,
+    verify_password,
+)
+from src.core.dataloaders import Loaders
+from src.core.exceptions import InvalidCredentialsError
+from src.core.logging import logger
+from src.features.auth.schemas import (
+    AuthPayload,
+    LoginInputValidation,
+    RegisterInputValidation,
+)
+from src.features.users.repository import UserRepository
+from src.features.users.schemas import CreateUserInputValidation, user_from_model
+from src.features.users.service import UserService
+
+
+class AuthService:
+    def __init__(self, session: AsyncSession, loaders: Optional[Loaders] = None):
+        self.session = session
+        self.repository = UserRepository(session)
+        self.users = UserService(session, loaders)
+
+    def _payload(self, user) -> AuthPayload:
+        return AuthPayload(
+            access_token=create_access_token(user.id),
+            token_type="bearer",
+            user=user,
+        )
+
+    async def register(self, data: RegisterInputValidation) -> AuthPayload:
+        # Cek email dulu supaya tidak membuang satu hash bcrypt untuk duplikat;
+        # lewat loader, jadi cek ulang di create_user tidak query lagi
+        if await self.users.find_by_email(str(data.email)):
+            raise ValueError(f"Email {data.email} already registered")
+
+        hashed = await hash_password(data.password)
+        user = await self.users.create_user(
+            CreateUserInputValidation(name=data.name, email=data.email),
+            hashed_password=hashed,
+        )
+        logger.info("user_registered", user_id=user.id)
+        return self._payload(user)
+
+    async def login(self, data: LoginInputValidation) -> AuthPayload:
+        user = await self.repository.get_by_email(str(data.email))
+        hashed: Optional[str] = user.hashed_password if user else None  # type: ignore
+
+        # Email tidak terdaftar tetap membayar satu verify dengan cost yang sama
+        valid = await verify_password(
+            data.password, hashed or await dummy_password_hash()
+        )
+        if not user or not hashed or not valid or not user.is_active:
+            logger.info("login_failed", email=str(data.email))
+            raise InvalidCredentialsError(message="Invalid email or password")
+
+        logger.info("user_logged_in", user_id=user.id)
+        return self._payload(user_from_model(user))
@@ -1,11 +1,21 @@
+from typing import AsyncGenerator
+
 import strawberry
 from strawberry.types import Info
 
-from src.core.exceptions import DatabaseError, ValidationError
+from src.config import settings
+from src.core.database import AsyncSessionLocal
+from src.core.exceptions import (
+    AuthenticationError,
+    DatabaseError,
+    InvalidInputError,
+    ValidationError,
+)
 from src.core.logging import logger
 from src.features.users.schemas import (
     CreateUserInput,
     DeleteResponse,
+    FollowResponse,
     UpdateUserInput,
     UserCollection,
     UserMutationSuccess,
@@ -50,13 +60,13 @@ class UserMutation:
     @strawberry.mutation
     async def createUser(self, info: Info, input: CreateUserInput) -> UserResponse:
         session = info.context["session"]
-        service = UserService(session)
+        service = UserService(session, info.context["loaders"])
 
         try:
             validated = input.validate()
             return await service.create_user(validated)
-        except ValidationError as e:
-            return e
+        except InvalidInputError as e:
+            return e.to_graphql()
         except Exception as e:
             logger.error("create_user_error", error=str(e))
             return ValidationError(message="Internal error", field=None)
@@ -66,7 +76,7 @@ class UserMutation:
         self, info: Info, id: int, input: UpdateUserInput
     ) -> UserResponse:
         session = info.context["session"]
-        service = UserService(session)
+        service = UserService(session, info.context["loaders"])
 
         try:
             validated = input.validate()
@@ -76,8 +86,8 @@ class UserMutation:
                 return UserNotFoundError()
 
             return result
-        except ValidationError as e:
-            return e
+        except InvalidInputError as e:
+            return e.to_graphql()
 
     @strawberry.mutation
     async def deleteUser(self, info: Info, id: int) -> DeleteResponse:
@@ -89,3 +99,60 @@ class UserMutation:
             return UserNotFoundError()
 
         return UserMutationSuccess(success=True, message="User deleted successfully")
+
+    @strawberry.mutation
+    async def followUser(self, info: Info, id: int) -> FollowResponse:
+        follower_id = info.context["auth"].user_id
+        if follower_id is None:
+            return AuthenticationError(message="Authentication required")
+
+        service = UserService(info.context["session"])
+        try:
+            result = await service.follow_user(follower_id, id)
+        except InvalidInputError as e:
+            return e.to_graphql()
+
+        if result is None:
+            return UserNotFoundError()
+        message = "User followed" if result else "Already following"
+        return UserMutationSuccess(success=True, message=message)
+
+    @strawberry.mutation
+    async def unfollowUser(self, info: Info, id: int) -> FollowResponse:
+        follower_id = info.context["auth"].user_id
+        if follower_id is None:
+            return AuthenticationError(message="Authentication required")
+
+        service = UserService(info.context["session"])
+        if not await service.unfollow_user(follower_id, id):
+            return UserNotFoundError(message="Not following this user")
+        return UserMutationSuccess(success=True, message="User unfollowed")
+
+
+@strawberry.type
+class UserSubscription:
+    @strawberry.subscription
+    async def usersStream(
+        self,
+        info: Info,
+        skip: int = 0,
+        limit: int = 1000,
+        batch_size: int = settings.USERS_STREAM_BATCH_SIZE,
+    ) -> AsyncGenerator[UserCollection, None]:
+        """
+        Page besar dikirim bertahap: setiap pesan berisi satu batch dari
+        server-side cursor, jadi first byte tidak menunggu seluruh list.
+        """
+        skip = max(0, skip)
+        limit = max(0, min(limit, settings.USERS_STREAM_MAX_LIMIT))
+        batch_size = max(1, min(batch_size, settings.USERS_STREAM_BATCH_SIZE * 10))
+
+        # Session sendiri: cursor tetap terbuka selama stream berjalan
+        async with AsyncSessionLocal() as session:
+            service = UserService(session)
+            try:
+                async for items in service.stream_users(skip, limit, batch_size):
+                    yield UserCollection(items=items)
+            except Exception as e:
+                logger.error("subscription_users_stream_error", error=str(e))
+                raise
@@ -1,10 +1,26 @@
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, func
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+    text,
+)
 
 from src.core.base import Base, SoftDeleteMixin
 
 
 class UserModel(Base, SoftDeleteMixin):
     __tablename__ = "users"
+    __table_args__ = (
+        # Semua query list/filter diawali is_deleted = 0
+        Index("ix_users_is_deleted_created_at", "is_deleted", "created_at"),
+        # Scan archival: is_deleted = 1 AND deleted_at < cutoff
+        Index("ix_users_is_deleted_deleted_at", "is_deleted", "deleted_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)  # type: ignore
@@ -13,6 +29,58 @@ class UserModel(Base, SoftDeleteMixin):
     is_active = Column(Boolean, default=True)  # type: ignore
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Counter di-maintain oleh follow/unfollow, bukan COUNT(*) per request
+    followers_count = Column(
+        Integer, default=0, server_default=text("0"), nullable=False
+    )
+    following_count = Column(
+        Integer, default=0, server_default=text("0"), nullable=False
+    )
 
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email})>"
+
+
+class FollowModel(Base):
+    """follower_id mengikuti followee_id"""
+
+    __tablename__ = "follows"
+    __table_args__ = (
+        # followers(first:) per user, terbaru dulu
+        Index("ix_follows_followee_created_at", "followee_id", "created_at"),
+        # following(first:) per user
+        Index("ix_follows_follower_created_at", "follower_id", "created_at"),
+    )
+
+    follower_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    followee_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self):
+        return f"<Follow({self.follower_id} -> {self.followee_id})>"
+
+
+class UserArchiveModel(Base):
+    """User yang sudah lama di-soft delete, dipindah keluar dari tabel users"""
+
+    __tablename__ = "users_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(100), nullable=False)  # type: ignore
+    email = Column(String(100), index=True, nullable=False)
+    hashed_password = Column(String(255), nullable=True)
+    is_active = Column(Boolean, default=True)  # type: ignore
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    is_deleted = Column(Boolean, default=True, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<UserArchive(id={self.id}, email={self.email})>"
@@ -1,10 +1,28 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from src.core.dataloaders import normalize_email
 from src.core.logging import logger
-from src.features.users.models import UserModel
+from src.features.users.models import FollowModel, UserArchiveModel, UserModel
+
+FOLLOWERS = "followers"
+FOLLOWING = "following"
+
+ARCHIVE_COLUMNS = [
+    "id",
+    "name",
+    "email",
+    "hashed_password",
+    "is_active",
+    "created_at",
+    "updated_at",
+    "is_deleted",
+    "deleted_at",
+]
 
 
 class UserRepository:
@@ -39,6 +57,8 @@ class UserRepository:
         return users
 
     async def get_by_email(self, email: str) -> Optional[UserModel]:
+        # Email disimpan ter-normalisasi (lowercase), jadi lookup tetap pakai index
+        email = normalize_email(email)
         result = await self.session.execute(
             select(UserModel)
             .where(UserModel.email == email)
@@ -61,12 +81,53 @@ class UserRepository:
         logger.debug("users_all_fetched", count=len(users), skip=skip, limit=limit)
         return users
 
-    async def create(self, name: str, email: str) -> UserModel:
-        existing = await self.get_by_email(email)
-        if existing:
-            raise ValueError(f"Email {email} already registered")
+    async def stream_all(
+        self, skip: int = 0, limit: int = 100, batch_size: int = 100
+    ) -> AsyncIterator[List[UserModel]]:
+        """
+        Seperti get_all, tapi lewat server-side cursor: row diambil dan
+        di-yield per batch sehingga memory tidak tumbuh dengan `limit`.
+        """
+        result = await self.session.stream_scalars(
+            select(UserModel)
+            .where(UserModel.is_deleted.is_(False))
+            .offset(skip)
+            .limit(limit)
+            .order_by(UserModel.created_at.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        async for users in result.partitions():
+            yield list(users)
 
-        user = UserModel(name=name, email=email)
+    async def count_active(self) -> int:
+        result = await self.session.execute(
+            select(func.count(UserModel.id)).where(UserModel.is_deleted.is_(False))
+        )
+        return result.scalar_one()
+
+    async def iter_active_ids(self, batch_size: int = 10_000) -> AsyncIterator[int]:
+        """Stream ID user aktif (server-side cursor), untuk rebuild bloom filter"""
+        result = await self.session.stream_scalars(
+            select(UserModel.id)
+            .where(UserModel.is_deleted.is_(False))
+            .execution_options(yield_per=batch_size)
+        )
+        async for user_id in result:
+            if user_id is not None:
+                yield user_id
+
+    async def max_id(self) -> int:
+        """ID terbesar (termasuk yang di-soft delete), 0 kalau tabel kosong"""
+        result = await self.session.execute(select(func.max(UserModel.id)))
+        return result.scalar_one_or_none() or 0
+
+    async def create(
+        self, name: str, email: str, hashed_password: Optional[str] = None
+    ) -> UserModel:
+        # Uniqueness email dicek di UserService lewat loader user_by_email;
+        # unique constraint tetap jadi guard terakhir (IntegrityError)
+        email = normalize_email(email)
+        user = UserModel(name=name, email=email, hashed_password=hashed_password)
         self.session.add(user)
         await self.session.flush()
         await self.session.refresh(user)
@@ -78,12 +139,8 @@ class UserRepository:
         if not user:
             return None
 
-        # Check email uniqueness kalau diupdate
-        if "email" in kwargs and kwargs["email"] != user.email:
-            existing = await self.get_by_email(kwargs["email"])
-            if existing:
-                raise ValueError("Email already in use")
-
+        if kwargs.get("email") is not None:
+            kwargs["email"] = normalize_email(kwargs["email"])
         for key, value in kwargs.items():
             if value is not None and hasattr(user, key):
                 setattr(user, key, value)
@@ -104,12 +161,229 @@ class UserRepository:
         logger.info("user_soft_deleted", user_id=user_id)
         return True
 
+    async def is_following(self, follower_id: int, followee_id: int) -> bool:
+        result = await self.session.execute(
+            select(FollowModel.follower_id)
+            .where(FollowModel.follower_id == follower_id)
+            .where(FollowModel.followee_id == followee_id)
+        )
+        return result.first() is not None
+
+    async def follow(self, follower_id: int, followee_id: int) -> bool:
+        """
+        Return False kalau sudah follow; counter kedua user ikut di-update.
+        Follow duplikat bersamaan / user yang tidak ada -> IntegrityError saat flush.
+        """
+        if await self.session.get(FollowModel, (follower_id, followee_id)):
+            return False
+
+        self.session.add(FollowModel(follower_id=follower_id, followee_id=followee_id))
+        await self.session.flush()
+        await self._adjust_follow_counters(follower_id, followee_id, 1)
+        logger.info("user_followed", follower_id=follower_id, followee_id=followee_id)
+        return True
+
+    async def unfollow(self, follower_id: int, followee_id: int) -> bool:
+        result = await self.session.execute(
+            delete(FollowModel)
+            .where(FollowModel.follower_id == follower_id)
+            .where(FollowModel.followee_id == followee_id)
+        )
+        if not result.rowcount:
+            return False
+
+        await self._adjust_follow_counters(follower_id, followee_id, -1)
+        logger.info("user_unfollowed", follower_id=follower_id, followee_id=followee_id)
+        return True
+
+    async def _adjust_follow_counters(
+        self, follower_id: int, followee_id: int, delta: int
+    ) -> None:
+        # UPDATE ... SET x = x + delta: aman untuk follow bersamaan.
+        # updated_at di-set ke nilainya sendiri supaya onupdate tidak jalan:
+        # di-follow bukan berarti profil berubah
+        await self.session.execute(
+            update(UserModel)
+            .where(UserModel.id == followee_id)
+            .values(
+                followers_count=UserModel.followers_count + delta,
+                updated_at=UserModel.updated_at,
+            )
+        )
+        await self.session.execute(
+            update(UserModel)
+            .where(UserModel.id == follower_id)
+            .values(
+                following_count=UserModel.following_count + delta,
+                updated_at=UserModel.updated_at,
+            )
+        )
+
+    async def detach_follows(self, user_ids: List[int]) -> List[int]:
+        """
+        Hapus semua follow milik user yang dihapus dan kurangi counter user
+        lainnya, supaya counter tetap sama dengan baris yang terlihat (follower
+        yang is_deleted tidak pernah ditampilkan). Return ID user lain yang
+        counter-nya berubah.
+        """
+        if not user_ids:
+            return []
+
+        involved = or_(
+            FollowModel.follower_id.in_(user_ids), FollowModel.followee_id.in_(user_ids)
+        )
+        result = await self.session.execute(
+            select(FollowModel.follower_id, FollowModel.followee_id).where(involved)
+        )
+        deleted = set(user_ids)
+        affected = {
+            user_id for row in result.all() for user_id in row if user_id not in deleted
+        }
+
+        for counter, own, other in (
+            (
+                UserModel.followers_count,
+                FollowModel.follower_id,
+                FollowModel.followee_id,
+            ),
+            (
+                UserModel.following_count,
+                FollowModel.followee_id,
+                FollowModel.follower_id,
+            ),
+        ):
+            lost = (
+                select(func.count())
+                .select_from(FollowModel)
+                .where(own.in_(user_ids))
+                .where(other == UserModel.id)
+                .scalar_subquery()
+            )
+            await self.session.execute(
+                update(UserModel)
+                .where(UserModel.id.in_(select(other).where(own.in_(user_ids))))
+                .values(
+                    {
+                        counter: counter - lost,
+                        UserModel.updated_at: UserModel.updated_at,
+                    }
+                )
+            )
+
+        await self.session.execute(delete(FollowModel).where(involved))
+        await self.session.execute(
+            update(UserModel)
+            .where(UserModel.id.in_(user_ids))
+            .values(
+                followers_count=0, following_count=0, updated_at=UserModel.updated_at
+            )
+        )
+        return sorted(affected)
+
+    async def get_follow_lists(
+        self, user_ids: List[int], first: int, direction: str
+    ) -> Dict[int, List[UserModel]]:
+        """
+        Batch fetch followers/following untuk banyak user sekaligus, maksimal
+        `first` per user (ROW_NUMBER() OVER (PARTITION BY parent)), satu query.
+        """
+        if not user_ids or first <= 0:
+            return {}
+
+        if direction == FOLLOWERS:
+            parent, other = FollowModel.followee_id, FollowModel.follower_id
+        else:
+            parent, other = FollowModel.follower_id, FollowModel.followee_id
+
+        row_number = (
+            func.row_number()
+            .over(
+                partition_by=parent,
+                order_by=(FollowModel.created_at.desc(), other.desc()),
+            )
+            .label("row_number")
+        )
+        ranked = (
+            select(UserModel, parent.label("parent_id"), row_number)
+            .join(FollowModel, UserModel.id == other)
+            .where(parent.in_(user_ids))
+            .where(UserModel.is_deleted.is_(False))
+            .subquery()
+        )
+        user = aliased(UserModel, ranked)
+        result = await self.session.execute(
+            select(ranked.c.parent_id, user)
+            .where(ranked.c.row_number <= first)
+            .order_by(ranked.c.parent_id, ranked.c.row_number)
+        )
+
+        lists: Dict[int, List[UserModel]] = {}
+        for parent_id, related in result.all():
+            lists.setdefault(parent_id, []).append(related)
+        logger.debug("follow_lists_fetched", direction=direction, parents=len(user_ids))
+        return lists
+
+    async def get_archived(self, user_id: int) -> Optional[UserArchiveModel]:
+        result = await self.session.execute(
+            select(UserArchiveModel).where(UserArchiveModel.id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def db_now(self) -> datetime:
+        """
+        NOW() dari database, format sama dengan deleted_at (soft_delete menulis
+        NOW() server, naive); dipakai untuk cutoff archival
+        """
+        result = await self.session.execute(select(func.now()))
+        return result.scalar_one()
+
+    async def archive_deleted_batch(
+        self, cutoff: datetime, batch_size: int
+    ) -> Tuple[int, List[int]]:
+        """
+        Pindahkan satu batch user yang di-soft delete sebelum cutoff ke users_archive.
+        Caller commit per batch supaya transaksi (dan lock) tetap pendek.
+        Return (jumlah diarsip, ID user lain yang counter follow-nya berubah).
+        """
+        result = await self.session.execute(
+            select(UserModel.id)
+            .where(UserModel.is_deleted.is_(True))
+            .where(UserModel.deleted_at < cutoff)
+            .order_by(UserModel.deleted_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        user_ids = [
+            user_id for user_id in result.scalars().all() if user_id is not None
+        ]
+        if not user_ids:
+            return 0, []
+
+        # Follow yang masih tersisa (soft delete lama) tidak boleh hilang lewat
+        # ON DELETE CASCADE tanpa mengurangi counter user lain
+        affected = await self.detach_follows(user_ids)
+        columns = [getattr(UserModel, name) for name in ARCHIVE_COLUMNS]
+        await self.session.execute(
+            insert(UserArchiveModel).from_select(
+                ARCHIVE_COLUMNS, select(*columns).where(UserModel.id.in_(user_ids))
+            )
+        )
+        await self.session.execute(delete(UserModel).where(UserModel.id.in_(user_ids)))
+        logger.info("users_archived", count=len(user_ids))
+        return len(user_ids), affected
+
     async def hard_delete(self, user_id: int) -> bool:
-        """Hanya untuk admin, permanent delete"""
-        user = await self.get_by_id(user_id, include_deleted=True)
-        if not user:
+        """Hanya untuk admin, permanent delete (termasuk user yang sudah diarsip)"""
+        user: Optional[Union[UserModel, UserArchiveModel]] = await self.get_by_id(
+            user_id, include_deleted=True
+        )
+        if user is None:
+            user = await self.get_archived(user_id)
+        if user is None:
             return False
 
+        if isinstance(user, UserModel):
+            await self.detach_follows([user_id])
         await self.session.delete(user)
         await self.session.flush()
         logger.info("user_hard_deleted", user_id=user_id)
@@ -1,10 +1,15 @@
 from datetime import datetime
-from typing import List, Optional, Union
+from typing import Any, List, Optional, Union
 
 import strawberry
 from pydantic import BaseModel, EmailStr, Field
+from strawberry.types import Info
 
-from src.core.exceptions import DatabaseError, ValidationError
+from src.core.cache_control import CacheControl, CacheControlScope
+from src.core.exceptions import AuthenticationError, DatabaseError, ValidationError
+
+# Batas `first` untuk followers/following per user
+MAX_FOLLOW_FIRST = 100
 
 
 # Pydantic untuk validation
@@ -21,19 +26,59 @@ class UpdateUserInputValidation(BaseModel):
     email: Optional[EmailStr] = None
 
 
-# Strawberry types
-@strawberry.type
+# Strawberry types; maxAge pendek karena cache HTTP tidak ikut di-invalidate
+@strawberry.type(directives=[CacheControl(max_age=30)])
 class User:
     id: int
     name: str
-    email: str
+    # Data pribadi: response yang memuat email tidak boleh disimpan shared cache
+    email: str = strawberry.field(
+        directives=[CacheControl(scope=CacheControlScope.PRIVATE)]
+    )
     is_active: bool
     created_at: Optional[datetime]
     updated_at: Optional[datetime]
+    followers_count: int = 0
+    following_count: int = 0
+
+    @strawberry.field
+    async def followers(self, info: Info, first: int = 10) -> "FollowConnection":
+        # Satu query window function untuk semua parent di level yang sama
+        items = await info.context["loaders"].followers_loader.load(
+            (self.id, max(0, min(first, MAX_FOLLOW_FIRST)))
+        )
+        return FollowConnection(total_count=self.followers_count, items=items)
+
+    @strawberry.field
+    async def following(self, info: Info, first: int = 10) -> "FollowConnection":
+        items = await info.context["loaders"].following_loader.load(
+            (self.id, max(0, min(first, MAX_FOLLOW_FIRST)))
+        )
+        return FollowConnection(total_count=self.following_count, items=items)
+
+
+def user_from_model(model: Any) -> User:
+    """UserModel -> User; satu konversi untuk service dan dataloaders"""
+    return User(
+        id=model.id,
+        name=model.name,
+        email=model.email,
+        is_active=model.is_active,
+        created_at=model.created_at,
+        updated_at=model.updated_at,
+        followers_count=model.followers_count or 0,
+        following_count=model.following_count or 0,
+    )
+
+
+@strawberry.type(directives=[CacheControl(max_age=10)])
+class UserCollection:
+    items: List[User]
 
 
-@strawberry.type
-class UserCollection:
+@strawberry.type(directives=[CacheControl(max_age=10)])
+class FollowConnection:
+    total_count: int  # dari counter di tabel users
     items: List[User]
 
 
@@ -61,6 +106,9 @@ class UserMutationSuccess:
 UserResponse = Union[User, UserNotFoundError, ValidationError, DatabaseError]
 UsersResponse = Union[UserCollection, DatabaseError]
 DeleteResponse = Union[UserMutationSuccess, UserNotFoundError]
+FollowResponse = Union[
+    UserMutationSuccess, UserNotFoundError, ValidationError, AuthenticationError
+]
 
 
 @strawberry.input
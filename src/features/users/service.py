@@ -1,41 +1,84 @@
-from typing import List, Optional
+import asyncio
+from datetime import timedelta
+from typing import AsyncIterator, List, Optional
 
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
+from src.core.bloom import IdFilter
 from src.core.cache import CacheService
-from src.core.exceptions import ValidationError
+from src.core.database import AsyncSessionLocal
+from src.core.dataloaders import Loaders
+from src.core.exceptions import InvalidInputError
+from src.core.invalidation import after_commit
 from src.core.logging import logger
-from src.features.users.models import UserModel
+from src.core.refresher import CacheRefresher
 from src.features.users.repository import UserRepository
 from src.features.users.schemas import (
     CreateUserInputValidation,
     UpdateUserInputValidation,
+    user_from_model,
 )
 from src.features.users.schemas import (
     User as UserSchema,
 )
 
+# Bloom filter ID user per-process, di-rebuild periodik dari lifespan
+user_id_filter = IdFilter(
+    error_rate=settings.USER_ID_FILTER_ERROR_RATE,
+    safety_margin=settings.USER_ID_FILTER_SAFETY_MARGIN,
+)
+
+
+async def rebuild_user_id_filter() -> None:
+    async with AsyncSessionLocal() as session:
+        repository = UserRepository(session)
+        # max_id dibaca sebelum scan: ID yang commit selama scan tidak ditolak
+        max_id = await repository.max_id()
+        capacity = await repository.count_active()
+        ids = [user_id async for user_id in repository.iter_active_ids()]
+    user_id_filter.rebuild(ids, capacity=max(capacity, 1000) * 2, max_id=max_id)
+    logger.info("user_id_filter_rebuilt", count=len(ids))
+
+
+async def archive_soft_deleted_users() -> int:
+    """Pindahkan user yang di-soft delete > N hari ke users_archive, batch kecil"""
+    async with AsyncSessionLocal() as session:
+        # Jam database, bukan jam aplikasi: deleted_at ditulis dengan NOW() server
+        now = await UserRepository(session).db_now()
+    cutoff = now - timedelta(days=settings.USER_ARCHIVE_AFTER_DAYS)
+    total = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            archived, affected = await UserRepository(session).archive_deleted_batch(
+                cutoff, settings.USER_ARCHIVE_BATCH_SIZE
+            )
+            # Counter follow user lain ikut berubah
+            after_commit(session, keys=[f"user:{user_id}" for user_id in affected])
+            await session.commit()
+        total += archived
+        if archived < settings.USER_ARCHIVE_BATCH_SIZE:
+            break
+        # Beri jeda supaya archival tidak bersaing dengan traffic normal
+        await asyncio.sleep(settings.USER_ARCHIVE_BATCH_PAUSE)
+
+    if total:
+        logger.info("user_archival_completed", archived=total)
+    return total
+
+
+LIST_CACHE_TTL = 60
+LIST_CACHE_PATTERN = "users:list:*"
+
 
 class UserService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, loaders: Optional[Loaders] = None):
         self.session = session
         self.repository = UserRepository(session)
         self.cache = CacheService()
-
-    def _to_schema(self, model: UserModel) -> UserSchema:
-        assert model.id is not None
-        assert model.name is not None
-        assert model.email is not None
-        assert model.is_active is not None
-        return UserSchema(
-            id=model.id,
-            name=model.name,
-            email=model.email,
-            is_active=model.is_active,
-            created_at=model.created_at,
-            updated_at=model.updated_at,
-        )
+        # Loader dari context GraphQL kalau ada, supaya lookup di-batch dan di-cache
+        self.loaders = loaders or Loaders(session)
 
     async def list_users(self, skip: int = 0, limit: int = 100) -> List[UserSchema]:
         cache_key = f"users:list:{skip}:{limit}"
@@ -43,41 +86,94 @@ class UserService:
         if cached:
             return cached
 
+        return await self.refresh_list(skip, limit)
+
+    async def stream_users(
+        self, skip: int = 0, limit: int = 100, batch_size: int = 100
+    ) -> AsyncIterator[List[UserSchema]]:
+        """List user per batch tanpa cache, untuk page besar (subscription usersStream)"""
+        async for users in self.repository.stream_all(skip, limit, batch_size):
+            yield [user_from_model(u) for u in users]
+
+    async def refresh_list(self, skip: int = 0, limit: int = 100) -> List[UserSchema]:
+        """Query database lalu tulis ulang cache list (dipakai juga oleh refresher)"""
         users = await self.repository.get_all(skip=skip, limit=limit)
-        results = [self._to_schema(u) for u in users]
-        await self.cache.set(cache_key, results, ttl=60)
+        results = [user_from_model(u) for u in users]
+        await self.cache.set(f"users:list:{skip}:{limit}", results, ttl=LIST_CACHE_TTL)
         return results
 
     async def get_user(self, user_id: int) -> Optional[UserSchema]:
+        if not user_id_filter.might_exist(user_id):
+            return None
+
         cache_key = f"user:{user_id}"
-        cached = await self.cache.get(cache_key, UserSchema)
-        if cached:
+        hit, cached = await self.cache.get_entry(cache_key, UserSchema)
+        if hit:
             return cached
 
+        return await self.refresh_user(user_id)
+
+    async def refresh_user(self, user_id: int) -> Optional[UserSchema]:
+        cache_key = f"user:{user_id}"
         user = await self.repository.get_by_id(user_id)
         if user:
-            result = self._to_schema(user)
+            result = user_from_model(user)
             await self.cache.set(cache_key, result)
             return result
+
+        await self.cache.set_negative([cache_key])
         return None
 
-    async def create_user(self, data: CreateUserInputValidation) -> UserSchema:
+    async def find_by_email(self, email: str) -> Optional[UserSchema]:
+        """Lookup lewat loader user_by_email (batched, di-cache per request)"""
+        return await self.loaders.user_by_email.load(email)
+
+    async def _ensure_email_available(
+        self, email: str, user_id: Optional[int] = None
+    ) -> None:
+        existing = await self.find_by_email(email)
+        if existing and existing.id != user_id:
+            raise InvalidInputError(
+                message=f"Email {email} already in use", field="email"
+            )
+
+    def _prime(self, user: UserSchema) -> None:
+        # Hasil mutation langsung terlihat oleh lookup berikutnya di request yang sama
+        self.loaders.user_loader.prime(user.id, user, force=True)
+        self.loaders.user_by_email.prime(user.email, user, force=True)
+
+    async def create_user(
+        self, data: CreateUserInputValidation, hashed_password: Optional[str] = None
+    ) -> UserSchema:
+        await self._ensure_email_available(str(data.email))
         try:
-            user = await self.repository.create(data.name, str(data.email))
+            user = await self.repository.create(
+                data.name, str(data.email), hashed_password=hashed_password
+            )
+            # Hapus juga negative entry kalau ID ini pernah di-lookup sebelum dibuat
+            after_commit(
+                self.session,
+                keys=[f"user:{user.id}"],
+                patterns=[LIST_CACHE_PATTERN],
+            )
             await self.session.commit()
-            await self.cache.delete_pattern("users:list:*")
-            return self._to_schema(user)
-        except ValueError as e:
-            await self.session.rollback()
-            raise ValidationError(message=str(e), field="email")
+            user_id_filter.add(user.id)  # type: ignore
+            result = user_from_model(user)
+            self._prime(result)
+            return result
         except IntegrityError as e:
             await self.session.rollback()
             logger.error("database_integrity_error", error=str(e))
-            raise ValidationError(message="Database error", field=None)
+            raise InvalidInputError(message="Database error", field=None)
 
     async def update_user(
         self, user_id: int, data: UpdateUserInputValidation
     ) -> Optional[UserSchema]:
+        previous: Optional[UserSchema] = None
+        if data.email:
+            await self._ensure_email_available(str(data.email), user_id)
+            # Email lama dibuang dari loader setelah update (batched/cached lookup)
+            previous = await self.loaders.user_loader.load(user_id)
         try:
             user = await self.repository.update(
                 user_id, name=data.name, email=str(data.email) if data.email else None
@@ -85,18 +181,95 @@ class UserService:
             if not user:
                 return None
 
+            after_commit(
+                self.session,
+                keys=[f"user:{user_id}"],
+                patterns=[LIST_CACHE_PATTERN],
+            )
             await self.session.commit()
-            await self.cache.delete(f"user:{user_id}")
-            await self.cache.delete_pattern("users:list:*")
-            return self._to_schema(user)
-        except ValueError as e:
+            result = user_from_model(user)
+            if previous is not None and previous.email != result.email:
+                self.loaders.user_by_email.clear(previous.email)
+            self._prime(result)
+            return result
+        except IntegrityError as e:
             await self.session.rollback()
-            raise ValidationError(message=str(e), field="email")
+            logger.error("database_integrity_error", error=str(e))
+            raise InvalidInputError(message="Email already in use", field="email")
 
     async def delete_user(self, user_id: int) -> bool:
         result = await self.repository.soft_delete(user_id)
         if result:
+            # Follow user yang dihapus ikut hilang, counter user lain dikurangi
+            affected = await self.repository.detach_follows([user_id])
+            after_commit(
+                self.session,
+                keys=[f"user:{user_id}", *(f"user:{i}" for i in affected)],
+                patterns=[LIST_CACHE_PATTERN],
+            )
             await self.session.commit()
-            await self.cache.delete(f"user:{user_id}")
-            await self.cache.delete_pattern("users:list:*")
         return result
+
+    async def follow_user(self, follower_id: int, followee_id: int) -> Optional[bool]:
+        """
+        Return None kalau user tujuan tidak ada, False kalau sudah follow.
+        Cache kedua user di-invalidate karena counter-nya berubah.
+        """
+        if follower_id == followee_id:
+            raise InvalidInputError(message="Cannot follow yourself", field="id")
+        users = await self.repository.get_by_ids([follower_id, followee_id])
+        if followee_id not in users:
+            return None
+        if follower_id not in users:
+            # Token milik user yang sudah dihapus
+            raise InvalidInputError(message="User not found", field="id")
+
+        try:
+            created = await self.repository.follow(follower_id, followee_id)
+            if created:
+                self._invalidate_follow(follower_id, followee_id)
+                await self.session.commit()
+            return created
+        except IntegrityError as e:
+            await self.session.rollback()
+            # Follow yang sama dari request lain commit duluan
+            if await self.repository.is_following(follower_id, followee_id):
+                return False
+            logger.error("database_integrity_error", error=str(e))
+            raise InvalidInputError(message="User not found", field="id")
+
+    async def unfollow_user(self, follower_id: int, followee_id: int) -> bool:
+        removed = await self.repository.unfollow(follower_id, followee_id)
+        if removed:
+            self._invalidate_follow(follower_id, followee_id)
+            await self.session.commit()
+        return removed
+
+    def _invalidate_follow(self, follower_id: int, followee_id: int) -> None:
+        after_commit(
+            self.session,
+            keys=[f"user:{follower_id}", f"user:{followee_id}"],
+            patterns=[LIST_CACHE_PATTERN],
+        )
+
+
+async def _refresh_list_key(session: AsyncSession, key: str) -> None:
+    # users:list:{skip}:{limit}
+    skip, limit = key.rsplit(":", 2)[1:]
+    await UserService(session).refresh_list(int(skip), int(limit))
+
+
+async def _refresh_user_key(session: AsyncSession, key: str) -> None:
+    # user:{id}
+    service = UserService(session)
+    hit, cached = await service.cache.get_entry(key, UserSchema)
+    if hit and cached is None:
+        # ID yang tidak ada (mis. di-scan scraper): jangan query DB tiap siklus,
+        # biarkan negative entry expire sendiri
+        return
+    await service.refresh_user(int(key.split(":", 1)[1]))
+
+
+def register_cache_refreshers(refresher: CacheRefresher) -> None:
+    refresher.register("users:list:", _refresh_list_key)
+    refresher.register("user:", _refresh_user_key)
@@ -1,23 +1,45 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 import strawberry
 from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.requests import HTTPConnection
+from fastapi.responses import JSONResponse, ORJSONResponse
 from prometheus_fastapi_instrumentator import Instrumentator
-from strawberry.fastapi import GraphQLRouter
+from strawberry.tools import merge_types
 
 from src.config import settings
-from src.core.database import engine, get_db
+from src.core.auth import (
+    Authenticator,
+    dummy_password_hash,
+    shutdown_password_pool,
+    start_password_pool,
+)
+from src.core.cache import CacheService
+from src.core.cache_control import CacheControlExtension
+from src.core.database import AsyncSessionLocal, engine, get_shared_session
 from src.core.dataloaders import Loaders
+from src.core.graphql import GraphQLRouter
+from src.core.invalidation import invalidation_queue, replay_outbox
 from src.core.logging import configure_logging, logger
+from src.core.metrics import mark_process_dead
+from src.core.profiling import SQLProfilingExtension, query_stats
+from src.core.refresher import CacheRefresher
 from src.core.security import (
     RateLimitExceeded,
     _rate_limit_exceeded_handler,
     get_cors_origins,
     limiter,
 )
-from src.features.users.graphql import UserMutation, UserQuery
+from src.core.tasks import cancel_tasks, run_periodically
+from src.features.auth.graphql import AuthMutation, AuthQuery
+from src.features.users.graphql import UserMutation, UserQuery, UserSubscription
+from src.features.users.service import (
+    archive_soft_deleted_users,
+    rebuild_user_id_filter,
+    register_cache_refreshers,
+)
 
 
 @asynccontextmanager
@@ -26,9 +48,72 @@ async def lifespan(app: FastAPI):
     configure_logging()
     logger.info("application_starting", environment=settings.ENVIRONMENT)
 
+    start_password_pool()
+    await dummy_password_hash()
+    invalidation_queue.start()
+
+    background_tasks: list[asyncio.Task] = []
+    if settings.USER_ID_FILTER_ENABLED:
+        background_tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    "rebuild_user_id_filter",
+                    rebuild_user_id_filter,
+                    settings.USER_ID_FILTER_REBUILD_INTERVAL,
+                )
+            )
+        )
+
+    if settings.INVALIDATION_OUTBOX_ENABLED:
+        background_tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    "replay_outbox",
+                    replay_outbox,
+                    settings.INVALIDATION_OUTBOX_REPLAY_INTERVAL,
+                )
+            )
+        )
+
+    if settings.USER_ARCHIVE_ENABLED:
+        background_tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    "archive_soft_deleted_users",
+                    archive_soft_deleted_users,
+                    settings.USER_ARCHIVE_INTERVAL,
+                )
+            )
+        )
+
+    if settings.CACHE_REFRESH_ENABLED:
+        refresher = CacheRefresher(
+            CacheService(),
+            top_n=settings.CACHE_REFRESH_TOP_N,
+            refresh_ahead=settings.CACHE_REFRESH_AHEAD,
+            concurrency=settings.CACHE_REFRESH_CONCURRENCY,
+            # Satu worker per key per siklus
+            lock_ttl=settings.CACHE_REFRESH_INTERVAL,
+        )
+        register_cache_refreshers(refresher)
+        background_tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    "cache_refresher",
+                    refresher.run_once,
+                    settings.CACHE_REFRESH_INTERVAL,
+                    run_immediately=False,
+                )
+            )
+        )
+
     yield
 
+    await cancel_tasks(background_tasks)
+    await invalidation_queue.stop()
+    shutdown_password_pool()
     await engine.dispose()
+    mark_process_dead()
     logger.info("application_stopped")
 
 
@@ -38,6 +123,7 @@ def create_app() -> FastAPI:
         debug=settings.DEBUG,
         version="1.0.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
         docs_url="/docs" if settings.DEBUG else None,
         redoc_url="/redoc" if settings.DEBUG else None,
     )
@@ -60,16 +146,26 @@ def create_app() -> FastAPI:
 
     # GraphQL Schema dengan error handling
     schema = strawberry.Schema(
-        query=UserQuery,
-        mutation=UserMutation,
+        query=merge_types("Query", (UserQuery, AuthQuery)),
+        mutation=merge_types("Mutation", (UserMutation, AuthMutation)),
+        subscription=UserSubscription,
         types=[],  # Daftarkan error types di sini jika perlu
+        extensions=[CacheControlExtension]
+        + (
+            [SQLProfilingExtension]
+            if settings.DEBUG and settings.SQL_PROFILING_ENABLED
+            else []
+        ),
     )
 
-    # Context dengan DataLoader
-    async def get_context(request: Request, session=Depends(get_db)):
+    # Context dengan DataLoader; satu session + Loaders per HTTP request,
+    # di-share oleh semua operation dalam satu batch. HTTPConnection supaya
+    # context juga bisa dibuat untuk subscription lewat WebSocket
+    async def get_context(request: HTTPConnection, session=Depends(get_shared_session)):
         return {
             "session": session,
-            "loaders": Loaders(session),
+            "loaders": Loaders(session, session_factory=AsyncSessionLocal),
+            "auth": Authenticator(request),
             "request": request,
             "logger": logger.bind(request_id=id(request)),
         }
@@ -78,6 +174,7 @@ def create_app() -> FastAPI:
         schema,
         context_getter=get_context,
         graphql_ide="apollo-sandbox" if settings.DEBUG else None,
+        max_batch_size=settings.GRAPHQL_MAX_BATCH_SIZE,
     )
 
     app.include_router(graphql_app, prefix="/graphql")
@@ -96,6 +193,12 @@ def create_app() -> FastAPI:
     async def health():
         return {"status": "healthy", "environment": settings.ENVIRONMENT}
 
+    if settings.DEBUG and settings.SQL_PROFILING_ENABLED:
+
+        @app.get("/debug/sql", include_in_schema=False)
+        async def sql_stats(limit: int = 50):
+            return {"statements": query_stats.snapshot(limit)}
+
     @app.exception_handler(Exception)
     async def global_exception_handler(request: Request, exc: Exception):
         logger.error("unhandled_exception", error=str(exc))
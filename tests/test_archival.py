@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.base import Base
+from src.features.users import service
+from src.features.users.models import UserArchiveModel, UserModel
+from src.features.users.repository import UserRepository
+
+
+@pytest.fixture
+async def engine(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(
+        service, "AsyncSessionLocal", async_sessionmaker(engine, expire_on_commit=False)
+    )
+    monkeypatch.setattr(service.settings, "USER_ARCHIVE_AFTER_DAYS", 30)
+    monkeypatch.setattr(service.settings, "USER_ARCHIVE_BATCH_SIZE", 2)
+    monkeypatch.setattr(service.settings, "USER_ARCHIVE_BATCH_PAUSE", 0)
+    yield engine
+    await engine.dispose()
+
+
+async def seed(session: AsyncSession) -> None:
+    now = await UserRepository(session).db_now()
+    days = [31, 32, 33, 40, 50, 29]  # 5 lewat cutoff, 1 belum
+    session.add_all(
+        [
+            UserModel(
+                name=f"old{i}",
+                email=f"old{i}@x.io",
+                is_deleted=True,
+                deleted_at=now - timedelta(days=age),
+            )
+            for i, age in enumerate(days)
+        ]
+    )
+    # Tepat di sekitar cutoff: 1 menit sebelum diarsip, 1 menit sesudah tidak
+    session.add_all(
+        [
+            UserModel(
+                name="edge-old",
+                email="edge-old@x.io",
+                is_deleted=True,
+                deleted_at=now - timedelta(days=30, minutes=1),
+            ),
+            UserModel(
+                name="edge-new",
+                email="edge-new@x.io",
+                is_deleted=True,
+                deleted_at=now - timedelta(days=30) + timedelta(minutes=1),
+            ),
+            UserModel(name="active", email="active@x.io"),
+        ]
+    )
+    await session.commit()
+
+
+async def test_archive_moves_rows_in_batches(engine):
+    async with AsyncSession(engine) as session:
+        await seed(session)
+        cutoff = await UserRepository(session).db_now() - timedelta(days=30)
+        # Satu batch tidak melebihi batch_size
+        archived, _ = await UserRepository(session).archive_deleted_batch(cutoff, 2)
+        assert archived == 2
+        await session.rollback()
+
+    assert await service.archive_soft_deleted_users() == 6
+
+    async with AsyncSession(engine) as session:
+        remaining = (await session.execute(select(UserModel.email))).scalars().all()
+        archived = (
+            (await session.execute(select(UserArchiveModel.email))).scalars().all()
+        )
+        count = await session.scalar(select(func.count(UserArchiveModel.id)))
+
+    assert sorted(remaining) == ["active@x.io", "edge-new@x.io", "old5@x.io"]
+    assert "edge-old@x.io" in archived
+    assert count == 6
+
+
+async def test_hard_delete_reaches_archived_users(engine):
+    async with AsyncSession(engine) as session:
+        await seed(session)
+    await service.archive_soft_deleted_users()
+
+    async with AsyncSession(engine) as session:
+        repo = UserRepository(session)
+        archived_id = await session.scalar(
+            select(UserArchiveModel.id).where(UserArchiveModel.email == "old0@x.io")
+        )
+        archived = await repo.get_archived(archived_id)
+        assert archived is not None and archived.is_deleted
+        assert await repo.get_by_id(archived_id, include_deleted=True) is None
+
+        assert await repo.hard_delete(archived_id)
+        assert await repo.get_archived(archived_id) is None
+        assert not await repo.hard_delete(archived_id)
@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+import pytest
+import strawberry
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from starlette.requests import Request
+
+from src.core import auth
+from src.core.base import Base
+from src.core.dataloaders import Loaders
+from src.features.auth.graphql import AuthMutation, AuthQuery
+from src.features.users.models import UserModel
+
+LOGIN = """
+mutation Login($email: String!, $password: String!) {
+  login(input: {email: $email, password: $password}) {
+    __typename
+    ... on AuthPayload { user { id } }
+    ... on AuthenticationError { message code }
+  }
+}
+"""
+
+
+def make_request(token: str) -> Request:
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    return Request({"type": "http", "headers": headers})
+
+
+def test_password_hash_roundtrip():
+    hashed = auth._hash_password("correct horse", rounds=4)
+    assert auth._verify_password("correct horse", hashed)
+    assert not auth._verify_password("wrong horse", hashed)
+    assert not auth._verify_password("correct horse", "not-a-bcrypt-hash")
+
+
+async def test_verify_password_runs_off_loop():
+    hashed = auth._hash_password("secret-password", rounds=4)
+    assert await auth.verify_password("secret-password", hashed)
+
+
+def test_authenticator_caches_verified_tokens(monkeypatch):
+    auth.token_cache.clear()
+    token = auth.create_access_token(7)
+    assert auth.Authenticator(make_request(token)).user_id == 7
+
+    # Token yang sudah ter-cache tidak di-verify ulang
+    monkeypatch.setattr(auth.jwt, "decode", None)
+    assert auth.Authenticator(make_request(token)).user_id == 7
+
+
+def test_authenticator_rejects_invalid_and_expired_tokens():
+    auth.token_cache.clear()
+    expired = auth.create_access_token(7, expires_delta=timedelta(seconds=-1))
+    assert auth.Authenticator(make_request(expired)).user_id is None
+    assert auth.Authenticator(make_request("garbage")).user_id is None
+
+
+async def test_dummy_hash_uses_configured_rounds(monkeypatch):
+    monkeypatch.setattr(auth.settings, "AUTH_BCRYPT_ROUNDS", 5)
+    monkeypatch.setattr(auth, "_dummy_hash", None)
+    dummy = await auth.dummy_password_hash()
+    assert dummy.startswith("$2b$05$")
+    assert await auth.dummy_password_hash() is dummy
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "email, password",
+    [("ana@x.io", "wrong-password"), ("nobody@x.io", "secret-password")],
+)
+async def test_login_failure_is_a_union_member(engine, monkeypatch, email, password):
+    monkeypatch.setattr(auth, "_dummy_hash", auth._hash_password("x", rounds=4))
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add(
+            UserModel(
+                name="ana",
+                email="ana@x.io",
+                hashed_password=auth._hash_password("secret-password", rounds=4),
+            )
+        )
+        await session.commit()
+
+        schema = strawberry.Schema(query=AuthQuery, mutation=AuthMutation)
+        result = await schema.execute(
+            LOGIN,
+            variable_values={"email": email, "password": password},
+            context_value={"session": session, "loaders": Loaders(session)},
+        )
+
+    # Bukan top-level error: client bisa memilih field lewat fragment
+    assert result.errors is None
+    assert result.data["login"] == {
+        "__typename": "AuthenticationError",
+        "message": "Invalid email or password",
+        "code": "UNAUTHORIZED",
+    }
+
+
+async def test_login_success_returns_payload(engine):
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add(
+            UserModel(
+                name="ana",
+                email="ana@x.io",
+                hashed_password=auth._hash_password("secret-password", rounds=4),
+            )
+        )
+        await session.commit()
+
+        schema = strawberry.Schema(query=AuthQuery, mutation=AuthMutation)
+        result = await schema.execute(
+            LOGIN,
+            variable_values={"email": "ana@x.io", "password": "secret-password"},
+            context_value={"session": session, "loaders": Loaders(session)},
+        )
+
+    assert result.errors is None
+    assert result.data["login"] == {"__typename": "AuthPayload", "user": {"id": 1}}
@@ -0,0 +1,40 @@
+from src.core.bloom import BloomFilter, IdFilter
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(i)
+
+    assert all(i in bloom for i in range(1000))
+    false_positives = sum(1 for i in range(1000, 11000) if i in bloom)
+    assert false_positives < 300
+
+
+def test_id_filter_rejects_only_known_ranges():
+    id_filter = IdFilter()
+    assert id_filter.might_exist(42)  # belum di-build: selalu permissive
+    assert not id_filter.might_exist(0)
+
+    id_filter.rebuild([1, 2, 3, 10], capacity=100)
+    assert id_filter.might_exist(10)
+    assert not id_filter.might_exist(5)
+    # ID baru di atas max_id (dibuat di worker lain) tidak boleh ditolak
+    assert id_filter.might_exist(11)
+
+    id_filter.add(5)
+    assert id_filter.might_exist(5)
+
+
+def test_id_filter_treats_ids_near_max_as_maybe():
+    # 101 belum commit saat rebuild, 102 sudah
+    id_filter = IdFilter(safety_margin=5)
+    ids = [i for i in range(1, 101) if i != 50]
+    id_filter.rebuild([*ids, 102], capacity=1000, max_id=102)
+    assert id_filter.might_exist(101)
+    assert not id_filter.might_exist(50)
+
+    # Tanpa margin, ID yang commit selama scan tetap di atas max_id yang dibaca dulu
+    id_filter = IdFilter()
+    id_filter.rebuild([1, 2, 3, 7], capacity=100, max_id=3)
+    assert id_filter.might_exist(5)
@@ -0,0 +1,141 @@
+from typing import List, Optional, Union
+
+import pytest
+import strawberry
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from src.core.cache_control import (
+    HINT_EXTENSION,
+    CacheControl,
+    CacheControlExtension,
+    CacheControlScope,
+    etag_matches,
+)
+from src.core.graphql import GraphQLRouter
+
+
+@strawberry.type(directives=[CacheControl(max_age=60)])
+class Item:
+    id: int
+    email: str = strawberry.field(
+        default="a@x.io", directives=[CacheControl(scope=CacheControlScope.PRIVATE)]
+    )
+
+    @strawberry.field(directives=[CacheControl(max_age=5)])
+    def price(self) -> int:
+        return 10
+
+
+@strawberry.type
+class Missing:
+    message: str = "missing"
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def item(self, id: int) -> Union[Item, Missing]:
+        return Item(id=id) if id > 0 else Missing()
+
+    @strawberry.field
+    def items(self) -> List[Item]:
+        return [Item(id=1), Item(id=2)]
+
+    @strawberry.field(directives=[CacheControl(scope=CacheControlScope.PRIVATE)])
+    def me(self) -> Optional[Item]:
+        return Item(id=1)
+
+    @strawberry.field
+    def now(self) -> int:
+        return 0
+
+
+@strawberry.type
+class Mutation:
+    @strawberry.mutation
+    def touch(self) -> int:
+        return 1
+
+
+@pytest.fixture
+async def client():
+    async def get_context():
+        return {}
+
+    app = FastAPI()
+    schema = strawberry.Schema(
+        query=Query, mutation=Mutation, extensions=[CacheControlExtension]
+    )
+    app.include_router(
+        GraphQLRouter(schema, context_getter=get_context), prefix="/graphql"
+    )
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("{ items { id } }", "max-age=60, public"),
+        ("{ items { id price } }", "max-age=5, public"),
+        ("{ items { id email } }", "max-age=60, private"),
+        ("{ item(id: 1) { ... on Item { id } } }", "max-age=60, public"),
+        ("{ item(id: 0) { __typename } }", "no-store"),
+        ("{ me { id } }", "max-age=60, private"),
+        ("{ now }", "no-store"),
+    ],
+)
+async def test_cache_control_header(client, query, expected):
+    response = await client.get("/graphql", params={"query": query})
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == expected
+
+
+async def test_etag_and_not_modified(client):
+    params = {"query": "{ items { id } }"}
+    first = await client.get("/graphql", params=params)
+    etag = first.headers["etag"]
+
+    cached = await client.get(
+        "/graphql", params=params, headers={"If-None-Match": f"W/{etag}"}
+    )
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    # Response tidak cacheable tidak diberi ETag
+    response = await client.get("/graphql", params={"query": "{ now }"})
+    assert "etag" not in response.headers
+
+
+async def test_batch_takes_smallest_policy(client):
+    response = await client.post(
+        "/graphql",
+        json=[{"query": "{ items { id } }"}, {"query": "{ items { price } }"}],
+    )
+    assert response.headers["cache-control"] == "max-age=5, public"
+
+    response = await client.post(
+        "/graphql",
+        json=[{"query": "{ items { id } }"}, {"query": "mutation { touch }"}],
+    )
+    assert response.headers["cache-control"] == "no-store"
+
+
+def test_hints_are_stored_per_schema():
+    # Hint di-cache di extensions field milik schema masing-masing
+    for _ in range(2):
+        schema = strawberry.Schema(query=Query, extensions=[CacheControlExtension])
+        context: dict = {}
+        result = schema.execute_sync("{ items { id } }", context_value=context)
+        assert result.errors is None
+        assert context["cache_policy"].header() == "max-age=60, public"
+    field = schema._schema.query_type.fields["items"]
+    assert HINT_EXTENSION in field.extensions
+
+
+def test_etag_matches():
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
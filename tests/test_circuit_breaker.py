@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+from src.core import cache as cache_module
+from src.core.cache import CacheService
+from src.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from src.core.redis import DEFAULT_NODE, InMemoryRedis
+
+
+class SlowRedis(InMemoryRedis):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self.slow = True
+
+    async def get(self, key):
+        self.calls += 1
+        if self.slow:
+            await asyncio.sleep(1)
+        return await super().get(key)
+
+
+def test_breaker_opens_then_probes_half_open(monkeypatch):
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=10)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    later = time.monotonic() + 11
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    # Hanya satu probe sekaligus
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    monkeypatch.setattr(time, "monotonic", lambda: later + 11)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+async def test_cache_short_circuits_slow_redis(monkeypatch):
+    breaker = CircuitBreaker("test-cache", failure_threshold=2, reset_timeout=60)
+    monkeypatch.setitem(cache_module.breakers, DEFAULT_NODE, breaker)
+    monkeypatch.setattr(cache_module.settings, "CACHE_OPERATION_TIMEOUT", 0.01)
+
+    cache = CacheService()
+    cache._redis = redis = SlowRedis()
+
+    assert await cache.get("user:1", dict) is None
+    assert await cache.get("user:1", dict) is None
+    assert breaker.state == OPEN
+    assert redis.calls == 2
+
+    # Circuit open: tidak ada I/O sama sekali
+    started = time.perf_counter()
+    assert await cache.get("user:1", dict) is None
+    assert time.perf_counter() - started < 0.01
+    assert redis.calls == 2
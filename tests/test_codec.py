@@ -0,0 +1,75 @@
+import os
+
+import orjson
+import pytest
+
+from src.core import codec
+from src.core.cache import CacheService
+from src.core.redis import InMemoryRedis
+from src.features.users.schemas import User
+
+PAYLOAD = orjson.dumps(
+    [
+        {"id": i, "name": f"user {i}", "email": f"user{i}@example.com"}
+        for i in range(100)
+    ]
+)
+
+
+def test_small_values_stored_raw():
+    blob = codec.encode(b'{"id":1}')
+    assert blob[:3] == codec.MAGIC + bytes((codec.VERSION, codec.RAW))
+    assert codec.decode(blob) == b'{"id":1}'
+
+
+def test_large_values_compressed():
+    blob = codec.encode(PAYLOAD, threshold=1024, codec=codec.ZLIB)
+    assert blob[2] == codec.ZLIB
+    assert len(blob) < len(PAYLOAD) / 3
+    assert codec.decode(blob) == PAYLOAD
+
+
+def test_incompressible_values_fall_back_to_raw():
+    data = os.urandom(4096)
+    blob = codec.encode(data, threshold=0, codec=codec.ZLIB)
+    assert blob[2] == codec.RAW
+    assert codec.decode(blob) == data
+
+
+def test_legacy_plain_json_is_readable():
+    assert codec.decode(PAYLOAD) == PAYLOAD
+
+
+def test_unknown_version_rejected():
+    with pytest.raises(codec.CodecError):
+        codec.decode(codec.MAGIC + bytes((99, codec.RAW)) + b"{}")
+
+
+async def test_cache_roundtrip_with_legacy_entry(monkeypatch):
+    monkeypatch.setattr(codec.settings, "CACHE_COMPRESSION_THRESHOLD", 64)
+    cache = CacheService()
+    cache._redis = redis = InMemoryRedis()
+    users = [
+        User(
+            id=i,
+            name=f"user {i}",
+            email=f"user{i}@example.com",
+            is_active=True,
+            created_at=None,
+            updated_at=None,
+        )
+        for i in range(20)
+    ]
+
+    await cache.set("users:list:0:20", users)
+    assert (await redis.get("users:list:0:20")).startswith(codec.MAGIC)
+    assert await cache.get("users:list:0:20", list[User]) == users
+
+    # Entry lama yang ditulis sebelum envelope ada
+    await redis.set(
+        "user:1",
+        b'{"id":1,"name":"a","email":"a@x.io","is_active":true,'
+        b'"created_at":null,"updated_at":null}',
+    )
+    user = await cache.get("user:1", User)
+    assert user is not None and user.email == "a@x.io"
@@ -0,0 +1,136 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core import cache as cache_module
+from src.core.base import Base
+from src.core.cache import CacheService
+from src.core.dataloaders import KeyedLoader, Loaders
+from src.core.redis import InMemoryRedis
+from src.features.users.models import UserModel
+from src.features.users.schemas import User
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    # File, bukan :memory:, supaya session lain melihat data yang sama
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as session:
+        session.add_all(
+            [UserModel(name=f"u{i}", email=f"u{i}@x.io") for i in range(1, 11)]
+        )
+        await session.commit()
+    yield engine
+    await engine.dispose()
+
+
+def count_statements(engine):
+    statements = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    return statements
+
+
+async def test_keyed_loader_chunks_and_deduplicates(engine):
+    statements = count_statements(engine)
+    factory = async_sessionmaker(engine)
+    async with AsyncSession(engine) as session:
+        loader = KeyedLoader(
+            session,
+            UserModel,
+            "id",
+            name="test",
+            max_batch_size=3,
+            session_factory=factory,
+        )
+        rows = await loader.load([1, 2, 2, 3, 4, 5, 6, 7, 99, 1])
+
+    ids = [row.id if row else None for row in rows]
+    assert ids == [1, 2, 2, 3, 4, 5, 6, 7, None, 1]
+    # 8 key unik -> 3 chunk
+    assert len(statements) == 3
+
+
+async def test_loading_by_id_primes_email_loader(engine, monkeypatch):
+    from src.features.users import service
+
+    monkeypatch.setattr(service.settings, "CACHE_ENABLED", False)
+    statements = count_statements(engine)
+
+    async with AsyncSession(engine) as session:
+        loaders = Loaders(session)
+        users = await loaders.user_loader.load_many([1, 2])
+        assert len(statements) == 1
+
+        # Sudah di-prime: tidak ada query, dan email dibandingkan case-insensitive
+        user = await loaders.user_by_email.load("U2@X.io")
+        assert user is users[1]
+        assert len(statements) == 1
+
+        # Load by email juga mengisi loader by id
+        by_email = await loaders.user_by_email.load("u5@x.io")
+        assert await loaders.user_loader.load(5) is by_email
+        assert len(statements) == 2
+
+
+async def test_user_loader_uses_cached_users(engine, monkeypatch):
+    redis = InMemoryRedis()
+    monkeypatch.setattr(cache_module, "get_cache_nodes", lambda: {"default": redis})
+    cache = CacheService()
+    cached_user = User(
+        id=3,
+        name="cached",
+        email="u3@x.io",
+        is_active=True,
+        created_at=None,
+        updated_at=None,
+    )
+    await cache.set("user:3", cached_user)
+    await cache.set_negative(["user:99"])
+    statements = count_statements(engine)
+
+    async with AsyncSession(engine) as session:
+        loaders = Loaders(session)
+        users = await loaders.user_loader.load_many([3, 4, 99])
+        assert [u.name if u else None for u in users] == ["cached", "u4", None]
+        # Hit positif dan negatif tidak di-query lagi
+        assert len(statements) == 1
+        assert await loaders.user_by_email.load("u3@x.io") == users[0]
+        assert len(statements) == 1
+
+
+async def test_email_lookup_is_case_insensitive(engine, monkeypatch):
+    from src.features.users import service
+    from src.features.users.schemas import (
+        CreateUserInputValidation,
+        UpdateUserInputValidation,
+    )
+
+    monkeypatch.setattr(service.settings, "CACHE_ENABLED", False)
+    monkeypatch.setattr(service, "after_commit", lambda *args, **kwargs: None)
+
+    # Sama seperti AsyncSessionLocal aplikasi
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        users = service.UserService(session)
+        with pytest.raises(service.InvalidInputError):
+            await users.create_user(
+                CreateUserInputValidation(name="dup", email="U1@X.io")
+            )
+
+        created = await users.create_user(
+            CreateUserInputValidation(name="new", email="New.User@X.io")
+        )
+        assert created.email == "new.user@x.io"
+        assert (await users.find_by_email("NEW.user@x.io")).id == created.id
+
+        # Setelah ganti email, email lama tidak lagi menunjuk ke user ini
+        await users.update_user(
+            created.id, UpdateUserInputValidation(email="Renamed@X.io")
+        )
+        assert await users.find_by_email("new.user@x.io") is None
+        assert (await users.find_by_email("renamed@x.io")).id == created.id
@@ -0,0 +1,206 @@
+from types import SimpleNamespace
+
+import pytest
+import strawberry
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.core.base import Base
+from src.core.dataloaders import Loaders
+from src.features.users.graphql import UserMutation, UserQuery
+from src.features.users.models import UserModel
+from src.features.users.repository import UserRepository
+from src.features.users.service import UserService
+
+QUERY = """
+{
+  users(limit: 10) {
+    ... on UserCollection {
+      items {
+        id
+        followersCount
+        followers(first: 2) {
+          totalCount
+          items { id followers(first: 5) { items { id } } }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+async def test_follow_maintains_counters(engine):
+    async with AsyncSession(engine) as session:
+        session.add_all([UserModel(name=f"u{i}", email=f"u{i}@x.io") for i in range(3)])
+        await session.flush()
+        repo = UserRepository(session)
+
+        assert await repo.follow(2, 1)
+        assert not await repo.follow(2, 1)
+        assert await repo.follow(3, 1)
+        assert await repo.unfollow(3, 1)
+        assert not await repo.unfollow(3, 1)
+        await session.commit()
+
+        users = {u.id: u for u in (await repo.get_by_ids([1, 2, 3])).values()}
+        await session.refresh(users[1])
+        await session.refresh(users[2])
+        assert (users[1].followers_count, users[1].following_count) == (1, 0)
+        assert (users[2].followers_count, users[2].following_count) == (0, 1)
+
+
+async def test_nested_followers_constant_queries(engine, monkeypatch):
+    from src.features.users import service
+
+    monkeypatch.setattr(service.settings, "CACHE_ENABLED", False)
+
+    async with AsyncSession(engine) as session:
+        session.add_all([UserModel(name=f"u{i}", email=f"u{i}@x.io") for i in range(6)])
+        await session.flush()
+        repo = UserRepository(session)
+        # Semua user saling follow
+        for follower in range(1, 7):
+            for followee in range(1, 7):
+                if follower != followee:
+                    await repo.follow(follower, followee)
+        await session.commit()
+
+        statements = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+        schema = strawberry.Schema(query=UserQuery)
+        result = await schema.execute(
+            QUERY, context_value={"session": session, "loaders": Loaders(session)}
+        )
+
+    assert result.errors is None
+    items = result.data["users"]["items"]
+    assert len(items) == 6
+    for item in items:
+        assert item["followersCount"] == 5
+        assert item["followers"]["totalCount"] == 5
+        assert len(item["followers"]["items"]) == 2
+        for follower in item["followers"]["items"]:
+            assert len(follower["followers"]["items"]) == 5
+
+    # 1 query list + 1 per level followers, tidak tergantung jumlah parent
+    assert len(statements) == 3
+    assert all("row_number" in s.lower() for s in statements[1:])
+
+
+async def test_deleting_user_detaches_follows(engine):
+    async with AsyncSession(engine) as session:
+        session.add_all([UserModel(name=f"u{i}", email=f"u{i}@x.io") for i in range(3)])
+        await session.flush()
+        repo = UserRepository(session)
+        for follower, followee in [(1, 2), (3, 2), (2, 1), (2, 3)]:
+            await repo.follow(follower, followee)
+        await session.commit()
+        users = await repo.get_by_ids([1, 2, 3])
+        before = {u.id: u.updated_at for u in users.values()}
+
+        assert await repo.soft_delete(3)
+        assert await repo.detach_follows([3]) == [2]
+        await session.commit()
+
+        users = await repo.get_by_ids([1, 2])
+        for user in users.values():
+            await session.refresh(user)
+        # Counter sama dengan baris follow yang masih terlihat
+        assert (users[2].followers_count, users[2].following_count) == (1, 1)
+        lists = await repo.get_follow_lists([2], 10, "followers")
+        assert [u.id for u in lists[2]] == [1]
+        # Counter follow tidak mengubah updated_at profil
+        assert users[1].updated_at == before[1]
+
+
+async def test_concurrent_duplicate_follow_is_not_an_error(engine, monkeypatch):
+    async with AsyncSession(engine) as session:
+        session.add_all([UserModel(name=f"u{i}", email=f"u{i}@x.io") for i in range(2)])
+        await session.commit()
+        service = UserService(session)
+        assert await service.follow_user(1, 2)
+
+        # Request lain sudah insert di antara cek dan insert
+        async def not_found(*args, **kwargs):
+            return None
+
+        monkeypatch.setattr(session, "get", not_found)
+        assert await service.follow_user(1, 2) is False
+
+
+FOLLOW = """
+mutation Follow($id: Int!) {
+  followUser(id: $id) {
+    __typename
+    ... on UserMutationSuccess { message }
+    ... on AuthenticationError { message code }
+    ... on ValidationError { message field }
+  }
+  unfollowUser(id: $id) {
+    __typename
+    ... on AuthenticationError { code }
+  }
+}
+"""
+
+
+@pytest.mark.parametrize(
+    "user_id, expected",
+    [
+        (
+            None,
+            {
+                "__typename": "AuthenticationError",
+                "message": "Authentication required",
+                "code": "UNAUTHORIZED",
+            },
+        ),
+        (
+            2,
+            {
+                "__typename": "ValidationError",
+                "message": "Cannot follow yourself",
+                "field": "id",
+            },
+        ),
+    ],
+)
+async def test_follow_errors_are_union_members(engine, user_id, expected):
+    async with AsyncSession(engine) as session:
+        session.add_all([UserModel(name=f"u{i}", email=f"u{i}@x.io") for i in range(2)])
+        await session.commit()
+
+        schema = strawberry.Schema(query=UserQuery, mutation=UserMutation)
+        result = await schema.execute(
+            FOLLOW,
+            variable_values={"id": 2},
+            context_value={
+                "session": session,
+                "loaders": Loaders(session),
+                "auth": SimpleNamespace(user_id=user_id),
+            },
+        )
+
+    # Bukan top-level error: client membaca error lewat fragment
+    assert result.errors is None
+    assert result.data["followUser"] == expected
+    if user_id is None:
+        assert result.data["unfollowUser"] == {
+            "__typename": "AuthenticationError",
+            "code": "UNAUTHORIZED",
+        }
@@ -0,0 +1,67 @@
+from typing import List
+
+import pytest
+import strawberry
+from fastapi import FastAPI
+from httpx import AsyncClient
+from strawberry.dataloader import DataLoader
+from strawberry.types import Info
+
+from src.core.graphql import GraphQLRouter
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def double(self, info: Info, n: int) -> int:
+        return await info.context["loader"].load(n)
+
+
+@pytest.fixture
+async def batches():
+    return []
+
+
+@pytest.fixture
+async def client(batches):
+    async def load(keys: List[int]) -> List[int]:
+        batches.append(keys)
+        return [key * 2 for key in keys]
+
+    async def get_context():
+        return {"loader": DataLoader(load_fn=load)}
+
+    app = FastAPI()
+    app.include_router(
+        GraphQLRouter(
+            strawberry.Schema(query=Query), context_getter=get_context, max_batch_size=3
+        ),
+        prefix="/graphql",
+    )
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        yield ac
+
+
+async def test_batch_shares_context_and_keeps_order(client, batches):
+    response = await client.post(
+        "/graphql",
+        json=[
+            {"query": "{ double(n: 1) }"},
+            {"query": "query Q($n: Int!) { double(n: $n) }", "variables": {"n": 2}},
+            {"query": "{ double(n: 3) }"},
+        ],
+    )
+    assert response.status_code == 200
+    assert [item["data"]["double"] for item in response.json()] == [2, 4, 6]
+    # Semua operation di-merge ke satu batch DataLoader
+    assert batches == [[1, 2, 3]]
+
+
+async def test_batch_size_is_limited(client):
+    response = await client.post("/graphql", json=[{"query": "{ double(n: 1) }"}] * 4)
+    assert response.status_code == 400
+
+
+async def test_single_operation_still_works(client):
+    response = await client.post("/graphql", json={"query": "{ double(n: 5) }"})
+    assert response.json() == {"data": {"double": 10}}
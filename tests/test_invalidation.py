@@ -0,0 +1,179 @@
+import asyncio
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from src.core import invalidation
+from src.core.cache import CacheService
+from src.core.invalidation import (
+    DELETE_KEY,
+    DELETE_PATTERN,
+    EVENT,
+    CacheOutboxModel,
+    InvalidationQueue,
+    Task,
+    after_commit,
+)
+from src.core.redis import InMemoryRedis
+
+
+class FlakyCache(CacheService):
+    def __init__(self, failures: int):
+        super().__init__()
+        self._redis = InMemoryRedis()
+        self.failures = failures
+        self.calls = []
+
+    async def delete(self, *keys, strict=False):
+        self.calls.append(("delete", keys))
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("redis down")
+        await super().delete(*keys, strict=strict)
+
+    async def delete_pattern(self, pattern, strict=False):
+        self.calls.append(("pattern", pattern))
+        await super().delete_pattern(pattern, strict=strict)
+
+
+async def test_queue_coalesces_and_deduplicates():
+    cache = FlakyCache(failures=0)
+    queue = InvalidationQueue(cache, coalesce_ms=0)
+    for user_id in (1, 2, 1):
+        queue.enqueue(
+            [Task(DELETE_KEY, f"user:{user_id}"), Task(DELETE_PATTERN, "users:*")]
+        )
+    await queue.drain()
+
+    assert sorted(cache.calls[0][1]) == ["user:1", "user:2"]
+    assert cache.calls[1:] == [("pattern", "users:*")]
+    await queue.stop()
+
+
+async def test_queue_retries_failed_invalidations():
+    cache = FlakyCache(failures=2)
+    await cache._redis.set("user:1", b"stale")
+    queue = InvalidationQueue(cache, coalesce_ms=0, retry_base=0.001)
+    queue.enqueue([Task(DELETE_KEY, "user:1")])
+
+    for _ in range(50):
+        if await cache._redis.get("user:1") is None:
+            break
+        await asyncio.sleep(0.01)
+
+    assert await cache._redis.get("user:1") is None
+    assert len(cache.calls) == 3
+    await queue.stop()
+
+
+async def test_retry_backoff_does_not_block_new_work_or_handlers():
+    cache = FlakyCache(failures=0)
+    queue = InvalidationQueue(cache, coalesce_ms=0, retry_base=60)
+    calls = []
+
+    async def ok(payload):
+        calls.append("ok")
+
+    async def flaky(payload):
+        calls.append("flaky")
+        if calls.count("flaky") == 1:
+            raise ConnectionError("webhook down")
+
+    queue.on("user.created", ok)
+    queue.on("user.created", flaky)
+    queue.enqueue([Task(EVENT, "user.created", '{"id": 1}')])
+    await queue.drain()
+    assert calls == ["ok", "flaky"]
+
+    # Retry menunggu 60 detik di background; invalidasi baru tetap jalan
+    await cache._redis.set("user:2", b"stale")
+    queue.enqueue([Task(DELETE_KEY, "user:2")])
+    for _ in range(50):
+        if await cache._redis.get("user:2") is None:
+            break
+        await asyncio.sleep(0.01)
+    assert await cache._redis.get("user:2") is None
+
+    # stop() mem-flush retry yang tertunda; handler yang sudah sukses tidak diulang
+    await queue.stop()
+    assert calls == ["ok", "flaky", "flaky"]
+
+
+async def test_after_commit_enqueues_only_committed_work(monkeypatch):
+    queued = []
+    monkeypatch.setattr(
+        invalidation.invalidation_queue,
+        "enqueue",
+        lambda tasks, outbox_ids=(): queued.extend(tasks),
+    )
+    engine = create_engine("sqlite://")
+
+    with Session(engine) as session:
+        session.execute(text("SELECT 1"))
+        after_commit(session, keys=["user:1"])
+        session.rollback()
+
+        session.execute(text("SELECT 1"))
+        after_commit(session, keys=["user:2"], patterns=["users:list:*"])
+        session.commit()
+
+    assert queued == [Task(DELETE_KEY, "user:2"), Task(DELETE_PATTERN, "users:list:*")]
+
+
+async def test_after_commit_skips_events_without_handlers(monkeypatch):
+    queued = []
+    monkeypatch.setattr(
+        invalidation.invalidation_queue,
+        "enqueue",
+        lambda tasks, outbox_ids=(): queued.extend(tasks),
+    )
+    engine = create_engine("sqlite://")
+
+    with Session(engine) as session:
+        session.execute(text("SELECT 1"))
+        after_commit(session, keys=["user:1"], events=[("user.unknown", {"id": 1})])
+        session.commit()
+
+    assert queued == [Task(DELETE_KEY, "user:1")]
+
+
+async def test_outbox_write_delete_and_replay(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/outbox.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(CacheOutboxModel.__table__.create)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    cache = FlakyCache(failures=1)
+    queue = InvalidationQueue(cache, coalesce_ms=0, max_retries=0)
+    monkeypatch.setattr(invalidation, "AsyncSessionLocal", sessions)
+    monkeypatch.setattr(invalidation, "invalidation_queue", queue)
+    monkeypatch.setattr(invalidation.settings, "INVALIDATION_OUTBOX_ENABLED", True)
+    # Grace negatif: row yang baru ditulis pun sudah boleh di-replay
+    monkeypatch.setattr(invalidation.settings, "INVALIDATION_OUTBOX_GRACE", -60)
+
+    async def outbox():
+        async with sessions() as session:
+            rows = await session.execute(select(CacheOutboxModel))
+            return [(row.kind, row.target) for row in rows.scalars()]
+
+    try:
+        await cache._redis.set("user:1", b"stale")
+        # Row outbox ditulis dalam transaksi yang sama dengan mutation
+        async with sessions() as session:
+            await session.execute(text("SELECT 1"))
+            after_commit(session, keys=["user:1"])
+            await session.commit()
+        assert await outbox() == [(DELETE_KEY, "user:1")]
+
+        # Invalidasi gagal (Redis down): row tetap tersimpan
+        await queue.stop()
+        assert await outbox() == [(DELETE_KEY, "user:1")]
+        assert await cache._redis.get("user:1") == b"stale"
+
+        # Replay setelah "restart": invalidasi sukses, row dihapus
+        assert await invalidation.replay_outbox() == 1
+        await queue.stop()
+        assert await cache._redis.get("user:1") is None
+        assert await outbox() == []
+    finally:
+        await engine.dispose()
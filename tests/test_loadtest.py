@@ -0,0 +1,80 @@
+import pytest
+
+from benchmarks.loadtest.baseline import compare
+from benchmarks.loadtest.histogram import LatencyHistogram
+
+
+def test_bucket_index_and_upper_bound():
+    hist = LatencyHistogram(sub_buckets=128)
+    # Di bawah sub_buckets: satu bucket per mikrodetik
+    assert [hist._index(v) for v in (0, 1, 127)] == [0, 1, 127]
+    assert hist._upper_bound(127) == 127
+
+    previous = -1
+    for value in [128, 129, 255, 256, 1000, 65_535, 10**6, 60 * 10**6]:
+        index = hist._index(value)
+        bound = hist._upper_bound(index)
+        assert index >= previous
+        # Upper bound bucket mencakup value, error relatif <= 1/sub_buckets
+        assert value <= bound <= value * (1 + 1 / 128)
+        previous = index
+
+
+def test_percentiles_within_bucket_error():
+    hist = LatencyHistogram()
+    assert hist.percentile(99) == 0.0
+
+    for ms in range(1, 1001):
+        hist.record(ms / 1000)
+
+    assert hist.percentile(50) == pytest.approx(500, rel=0.01)
+    assert hist.percentile(99) == pytest.approx(990, rel=0.01)
+    # Percentile tidak pernah melebihi nilai terbesar yang direkam
+    assert hist.percentile(100) == 1000
+    summary = hist.summary()
+    assert summary["count"] == 1000
+    assert summary["mean_ms"] == pytest.approx(500.5)
+    assert summary["max_ms"] == 1000
+
+
+def test_merge_combines_workers():
+    fast, slow = LatencyHistogram(), LatencyHistogram()
+    for _ in range(90):
+        fast.record(0.001)
+    for _ in range(10):
+        slow.record(0.1)
+
+    merged = LatencyHistogram().merge([fast, slow])
+    assert merged.total == 100
+    assert merged.percentile(50) == pytest.approx(1, rel=0.01)
+    assert merged.percentile(99) == pytest.approx(100, rel=0.01)
+    assert merged.min == 1000 and merged.max == 100_000
+
+
+BASELINE = {
+    "throughput_rps": 1000,
+    "operations": {
+        "user": {"p99_ms": 10.0},
+        "users": {"p99_ms": 20.0},
+    },
+}
+
+
+def test_compare_passes_within_threshold():
+    current = {
+        "throughput_rps": 950,
+        "operations": {"user": {"p99_ms": 10.9}, "users": {"p99_ms": 15.0}},
+    }
+    assert compare(current, BASELINE, threshold=0.1) == []
+
+
+def test_compare_reports_throughput_and_p99_regressions():
+    current = {
+        "throughput_rps": 850,
+        "operations": {"user": {"p99_ms": 11.5}, "users": {"p99_ms": 20.0}},
+    }
+    regressions = compare(current, BASELINE, threshold=0.1)
+    assert regressions == [
+        "throughput 850 rps < baseline 1000 rps",
+        "user p99 11.5 ms > baseline 10.0 ms",
+    ]
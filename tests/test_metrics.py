@@ -0,0 +1,79 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.cache import CacheService
+from src.core.database import InstrumentedQueuePool
+from src.core.metrics import instrument_batch
+from src.core.redis import InMemoryRedis
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class BrokenRedis(InMemoryRedis):
+    async def get(self, key):
+        raise ConnectionError("redis down")
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+    )
+    yield engine
+    await engine.dispose()
+
+
+async def test_pool_gauges_return_to_zero_after_checkin(engine):
+    first = await engine.connect()
+    second = await engine.connect()
+    try:
+        await first.execute(text("SELECT 1"))
+        assert sample("db_pool_checked_out") == 2
+        assert sample("db_pool_overflow") == 1
+    finally:
+        await second.close()
+        await first.close()
+    # Gauge di-refresh setelah koneksi kembali ke queue, bukan saat event checkin
+    assert engine.sync_engine.pool.checkedout() == 0
+    assert sample("db_pool_checked_out") == 0
+    assert sample("db_pool_overflow") == 0
+
+
+async def test_instrument_batch_records_size_and_latency():
+    size_before = sample("dataloader_batch_size_sum", loader="test_batch")
+    count_before = sample("dataloader_batch_seconds_count", loader="test_batch")
+
+    async def load(keys):
+        return [key * 2 for key in keys]
+
+    assert await instrument_batch("test_batch", load)([1, 2, 3]) == [2, 4, 6]
+    assert sample("dataloader_batch_size_sum", loader="test_batch") == size_before + 3
+    assert (
+        sample("dataloader_batch_seconds_count", loader="test_batch")
+        == count_before + 1
+    )
+
+
+async def test_cache_requests_count_hit_miss_and_error():
+    def requests(result):
+        return sample("cache_requests_total", operation="get", result=result)
+
+    before = {result: requests(result) for result in ("hit", "miss", "error")}
+    cache = CacheService({"metrics": InMemoryRedis()})
+    await cache.set("user:1", {"id": 1})
+    assert await cache.get("user:1", dict) == {"id": 1}
+    assert await cache.get("user:2", dict) is None
+
+    broken = CacheService({"metrics-broken": BrokenRedis()})
+    assert await broken.get("user:1", dict) is None
+
+    assert requests("hit") == before["hit"] + 1
+    assert requests("miss") == before["miss"] + 1
+    assert requests("error") == before["error"] + 1
@@ -0,0 +1,106 @@
+import pytest
+import strawberry
+from sqlalchemy import create_engine, text
+
+from src.core import profiling
+from src.core.profiling import (
+    QueryStats,
+    SQLProfilingExtension,
+    fingerprint,
+    install_sql_profiling,
+)
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.warnings = []
+
+    def warning(self, event, **fields):
+        self.warnings.append((event, fields))
+
+    def debug(self, event, **fields):
+        pass
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(profiling, "query_stats", QueryStats())
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)"))
+    yield engine
+    engine.dispose()
+
+
+def test_fingerprint_normalizes_literals_and_in_lists():
+    a = fingerprint(
+        "SELECT users.id FROM users WHERE users.id IN (%s, %s, %s) AND name = 'bob'"
+    )
+    b = fingerprint("SELECT users.id  FROM users\nWHERE users.id IN (?) AND name = 'x'")
+    assert a == b == "SELECT users.id FROM users WHERE users.id IN (...) AND name = ?"
+
+
+def test_query_stats_aggregates_per_fingerprint():
+    stats = QueryStats()
+    for ms in range(1, 101):
+        stats.record("SELECT ?", ms / 1000)
+
+    [row] = stats.snapshot()
+    assert row["count"] == 100
+    assert row["p99Ms"] == 100.0
+
+
+def test_slow_query_is_logged_with_explain(engine, monkeypatch):
+    log = RecordingLogger()
+    monkeypatch.setattr(profiling, "logger", log)
+    install_sql_profiling(engine, slow_query_ms=0, explain_slow=True)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT name FROM users WHERE id = :id"), {"id": 1})
+        conn.execute(text("INSERT INTO users (name) VALUES ('ana')"))
+
+    [select, insert] = [fields for event, fields in log.warnings]
+    assert select["fingerprint"] == "SELECT name FROM users WHERE id = ?"
+    # SQLite: EXPLAIN QUERY PLAN, lookup lewat primary key
+    assert select["explain"] and "users" in str(select["explain"])
+    # Hanya SELECT yang di-EXPLAIN
+    assert insert["explain"] is None
+
+
+def test_failed_statement_does_not_leak_start_time(engine):
+    install_sql_profiling(engine, slow_query_ms=1000)
+
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(Exception):
+                conn.execute(text("SELECT * FROM missing"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info["query_start"] == {}
+
+
+def test_extension_reports_request_statements(engine):
+    install_sql_profiling(engine, slow_query_ms=1000)
+
+    @strawberry.type
+    class Query:
+        @strawberry.field
+        def names(self, ids: list[int]) -> list[str]:
+            names = []
+            with engine.connect() as conn:
+                for user_id in ids:
+                    row = conn.execute(
+                        text("SELECT name FROM users WHERE id = :id"), {"id": user_id}
+                    ).first()
+                    names.append(row[0] if row else "")
+                conn.execute(text("SELECT 1"))
+            return names
+
+    schema = strawberry.Schema(query=Query, extensions=[SQLProfilingExtension])
+    result = schema.execute_sync("{ names(ids: [1, 2, 3]) }")
+
+    assert result.errors is None
+    sql = result.extensions["sql"]
+    assert sql["count"] == 4
+    assert [s["fingerprint"] for s in sql["statements"]][-1] == "SELECT ?"
+    # Statement yang sama per item: kandidat N+1
+    assert sql["repeated"] == {"SELECT name FROM users WHERE id = ?": 3}
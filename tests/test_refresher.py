@@ -0,0 +1,28 @@
+import asyncio
+
+from src.core import cache as cache_module
+from src.core.cache import CacheService
+from src.core.redis import InMemoryRedis
+from src.core.refresher import CacheRefresher
+
+
+async def test_refresh_lock_allows_one_worker_per_key(monkeypatch):
+    redis = InMemoryRedis()
+    monkeypatch.setattr(cache_module, "get_cache_nodes", lambda: {"default": redis})
+    refreshed = []
+
+    async def refresh(session, key):
+        refreshed.append(key)
+
+    # Dua "worker" dengan hot key yang sama
+    workers = [
+        CacheRefresher(
+            CacheService(), top_n=10, refresh_ahead=15, concurrency=2, lock_ttl=10
+        )
+        for _ in range(2)
+    ]
+    for worker in workers:
+        worker.register("user:", refresh)
+
+    await asyncio.gather(*(worker._refresh("user:1") for worker in workers))
+    assert refreshed == ["user:1"]
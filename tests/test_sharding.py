@@ -0,0 +1,71 @@
+from collections import Counter
+
+from src.core.cache import CacheService
+from src.core.redis import InMemoryRedis
+from src.core.sharding import RendezvousHash, node_name
+
+KEYS = [f"user:{i}" for i in range(3000)]
+
+
+def test_rendezvous_spreads_and_remaps_minimally():
+    ring = RendezvousHash(["a", "b", "c"])
+    counts = Counter(ring.node_for(key) for key in KEYS)
+    assert set(counts) == {"a", "b", "c"}
+    assert min(counts.values()) > len(KEYS) / 3 * 0.8
+
+    # Node baru hanya mengambil ~1/4 key, dan key yang pindah hanya ke node baru
+    grown = RendezvousHash(["a", "b", "c", "d"])
+    moved = [key for key in KEYS if grown.node_for(key) != ring.node_for(key)]
+    assert all(grown.node_for(key) == "d" for key in moved)
+    assert len(KEYS) * 0.2 < len(moved) < len(KEYS) * 0.3
+
+
+def test_node_name_hides_password():
+    assert node_name("redis://:secret@cache-1:6380/2") == "cache-1:6380/2"
+    assert node_name("memory://b") == "b"
+
+
+class CountingRedis(InMemoryRedis):
+    def __init__(self):
+        super().__init__()
+        self.mget_calls = 0
+
+    async def mget(self, keys, *args):
+        self.mget_calls += 1
+        return await super().mget(keys, *args)
+
+
+async def test_cache_routes_keys_and_groups_mget_per_node():
+    nodes = {name: CountingRedis() for name in ("a", "b", "c")}
+    cache = CacheService(nodes)
+    keys = KEYS[:30]
+
+    for key in keys:
+        await cache.set(key, {"key": key})
+    for key in keys:
+        owner = cache.ring.node_for(key)
+        assert all(
+            (key.encode() in n._data) == (name == owner) for name, n in nodes.items()
+        )
+        assert await cache.get(key, dict) == {"key": key}
+
+    await cache.set_negative(keys[:10])
+    found = await cache.get_many([*keys, "user:missing"], dict)
+    assert found == {key: None if key in keys[:10] else {"key": key} for key in keys}
+    # Satu MGET per node, bukan per key
+    assert [n.mget_calls for n in nodes.values()] == [1, 1, 1]
+
+
+async def test_delete_pattern_fans_out_to_all_nodes():
+    nodes = {name: InMemoryRedis() for name in ("a", "b", "c")}
+    cache = CacheService(nodes)
+    for key in KEYS[:30]:
+        await cache.set(key, 1)
+    await cache.set("other:1", 1)
+
+    await cache.delete_pattern("user:*", strict=True)
+
+    remaining = [key for n in nodes.values() for key in n._data]
+    assert remaining == [b"other:1"]
+    ttl, missing = await cache.ttl_many(["other:1", "user:1"])
+    assert ttl > 0 and missing == -2
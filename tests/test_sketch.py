@@ -0,0 +1,35 @@
+from src.core.sketch import CountMinSketch, HotKeyTracker
+
+
+def test_count_min_sketch_never_underestimates():
+    sketch = CountMinSketch(width=64, depth=4)
+    for i in range(200):
+        sketch.add(f"user:{i % 20}")
+
+    assert all(sketch.estimate(f"user:{i}") >= 10 for i in range(20))
+
+    sketch.decay()
+    assert sketch.estimate("user:0") >= 5
+
+
+def test_hot_key_tracker_ranks_by_frequency():
+    tracker = HotKeyTracker(capacity=3)
+    for key, hits in [("users:list:0:20", 10), ("user:1", 5), ("user:2", 1)]:
+        for _ in range(hits):
+            tracker.record(key)
+    tracker.record("user:3")
+
+    assert tracker.top(2) == ["users:list:0:20", "user:1"]
+    assert len(tracker.top(10)) == 3
+
+
+def test_hot_key_tracker_evicts_coldest_when_full():
+    tracker = HotKeyTracker(capacity=3)
+    for key, hits in [("a", 5), ("b", 4), ("c", 3)]:
+        for _ in range(hits):
+            tracker.record(key)
+    for i in range(50):
+        tracker.record(f"cold:{i}")
+
+    assert len(tracker.top(10)) == 3
+    assert tracker.top(2) == ["a", "b"]
@@ -0,0 +1,63 @@
+import strawberry
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.base import Base
+from src.features.users import graphql
+from src.features.users.graphql import UserQuery, UserSubscription
+from src.features.users.models import UserModel
+from src.features.users.service import UserService
+
+
+async def test_stream_users_yields_batches():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine) as session:
+        session.add_all(
+            [UserModel(name=f"user{i}", email=f"user{i}@example.com") for i in range(7)]
+        )
+        session.add(UserModel(name="gone", email="gone@example.com", is_deleted=True))
+        await session.commit()
+
+        service = UserService(session)
+        batches = [
+            batch async for batch in service.stream_users(skip=1, limit=6, batch_size=4)
+        ]
+
+    assert [len(batch) for batch in batches] == [4, 2]
+    emails = {user.email for batch in batches for user in batch}
+    assert "gone@example.com" not in emails
+    await engine.dispose()
+
+
+async def test_users_stream_subscription_clamps_skip_and_limit(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/stream.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessions() as session:
+        session.add_all(
+            [UserModel(name=f"user{i}", email=f"user{i}@example.com") for i in range(7)]
+        )
+        await session.commit()
+
+    # Subscription membuka session sendiri lewat AsyncSessionLocal
+    monkeypatch.setattr(graphql, "AsyncSessionLocal", sessions)
+    monkeypatch.setattr(graphql.settings, "USERS_STREAM_MAX_LIMIT", 5)
+
+    schema = strawberry.Schema(query=UserQuery, subscription=UserSubscription)
+    stream = await schema.subscribe(
+        "subscription { usersStream(skip: -3, limit: 100, batchSize: 2) "
+        "{ items { id } } }"
+    )
+    results = [result async for result in stream]
+    await engine.dispose()
+
+    assert all(result.errors is None for result in results)
+    batches = [
+        [item["id"] for item in result.data["usersStream"]["items"]]
+        for result in results
+    ]
+    # Terbaru dulu; skip negatif jadi 0, limit dipotong ke USERS_STREAM_MAX_LIMIT
+    assert batches == [[7, 6], [5, 4], [3]]